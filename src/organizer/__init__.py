@@ -12,6 +12,7 @@ from .models import (
     Classification,
     PlanItem,
     ExecutionResult,
+    Category,
     VALID_CATEGORIES,
     VALID_ACTIONS,
 )
@@ -20,6 +21,9 @@ from .scanner import (
     EXCLUDED_DIRECTORIES,
     EXCLUDED_EXTENSIONS,
     DEFAULT_MIN_FILE_SIZE,
+    DEFAULT_HASH_WORKERS,
+    DEFAULT_WALK_WORKERS,
+    HASH_BLOCK_SIZE,
     calculate_sha256,
     should_exclude_directory,
     should_exclude_file,
@@ -50,7 +54,10 @@ from .llm import (
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT,
     DEFAULT_MAX_RETRIES,
+    DEFAULT_FAST_MODEL,
     build_classification_prompt,
+    build_file_prompt,
+    CLASSIFICATION_SYSTEM_PROMPT,
     parse_llm_response,
     validate_classification_json,
 )
@@ -85,6 +92,7 @@ __all__ = [
     "Classification",
     "PlanItem",
     "ExecutionResult",
+    "Category",
     "VALID_CATEGORIES",
     "VALID_ACTIONS",
     # Scanner
@@ -92,6 +100,9 @@ __all__ = [
     "EXCLUDED_DIRECTORIES",
     "EXCLUDED_EXTENSIONS",
     "DEFAULT_MIN_FILE_SIZE",
+    "DEFAULT_HASH_WORKERS",
+    "DEFAULT_WALK_WORKERS",
+    "HASH_BLOCK_SIZE",
     "calculate_sha256",
     "should_exclude_directory",
     "should_exclude_file",
@@ -119,7 +130,10 @@ __all__ = [
     "DEFAULT_BASE_URL",
     "DEFAULT_TIMEOUT",
     "DEFAULT_MAX_RETRIES",
+    "DEFAULT_FAST_MODEL",
     "build_classification_prompt",
+    "build_file_prompt",
+    "CLASSIFICATION_SYSTEM_PROMPT",
     "parse_llm_response",
     "validate_classification_json",
     # Planner
@@ -277,14 +277,19 @@ def scan(
     scanner = Scanner(min_file_size=min_size)
     
     try:
-        records = list(scanner.scan(directory))
+        if verbose or output:
+            records = list(scanner.scan(directory))
+        else:
+            # Counts only: walk without hashing or building records
+            records = []
+            scanner.scan_stats(directory)
     except ValueError as e:
         click.echo(f"Error: {e}", err=True)
         raise SystemExit(1)
     
     # Show results
     if not quiet:
-        click.echo(f"\nFound {len(records)} files")
+        click.echo(f"\nFound {scanner.stats['files_scanned']} files")
         click.echo(f"  Scanned: {scanner.stats['files_scanned']}")
         click.echo(f"  Excluded: {scanner.stats['files_excluded']}")
         click.echo(f"  Directories excluded: {scanner.stats['directories_excluded']}")
@@ -24,8 +24,11 @@ Safety Features:
 - Tracks statistics for audit/debugging
 """
 import mimetypes
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Generator, Optional, List
+from typing import Dict, Generator, Optional, List, Tuple
 import logging
 
 from src.organizer.models import FileRecord
@@ -44,6 +47,8 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_MAX_EXCERPT_BYTES: int = 8192  # 8KB
 DEFAULT_MAX_PDF_PAGES: int = 5
+DEFAULT_EXTRACT_WORKERS: int = 8  # concurrent extractions in extract_many
+DEFAULT_CACHE_SIZE: int = 1024  # cached (mime, excerpt) results per Extractor
 
 # Supported text extensions (can be read directly)
 TEXT_EXTENSIONS = {
@@ -141,6 +146,39 @@ def _get_mutagen():
         return None
 
 
+def _get_mutagen_dispatch() -> Dict[str, type]:
+    """
+    Map audio extensions to their mutagen format class.
+
+    Lets extract_audio_metadata skip mutagen's autodetection, which
+    scores every supported format against the file header.
+    """
+    try:
+        from mutagen.aac import AAC
+        from mutagen.aiff import AIFF
+        from mutagen.asf import ASF
+        from mutagen.flac import FLAC
+        from mutagen.mp3 import MP3
+        from mutagen.mp4 import MP4
+        from mutagen.oggopus import OggOpus
+        from mutagen.oggvorbis import OggVorbis
+        from mutagen.wave import WAVE
+    except ImportError:
+        return {}
+    
+    return {
+        ".mp3": MP3,
+        ".m4a": MP4,
+        ".aac": AAC,
+        ".flac": FLAC,
+        ".ogg": OggVorbis,
+        ".opus": OggOpus,
+        ".wav": WAVE,
+        ".wma": ASF,
+        ".aiff": AIFF,
+    }
+
+
 def _get_ffprobe():
     """Check if ffprobe is available for video metadata."""
     import shutil
@@ -171,12 +209,13 @@ Presentation = None
 pd = None
 Image = None
 mutagen = None
+mutagen_dispatch = None
 ffprobe_path = None
 
 
 def _init_lazy_imports():
     """Initialize lazy imports on first use."""
-    global pdfplumber, Document, Presentation, pd, Image, mutagen, ffprobe_path
+    global pdfplumber, Document, Presentation, pd, Image, mutagen, mutagen_dispatch, ffprobe_path
     if pdfplumber is None:
         pdfplumber = _get_pdfplumber()
     if Document is None:
@@ -189,6 +228,8 @@ def _init_lazy_imports():
         Image = _get_pillow()
     if mutagen is None:
         mutagen = _get_mutagen()
+    if mutagen_dispatch is None:
+        mutagen_dispatch = _get_mutagen_dispatch()
     if ffprobe_path is None:
         ffprobe_path = _get_ffprobe()
 
@@ -526,7 +567,12 @@ def extract_audio_metadata(file_path: Path) -> Optional[str]:
         return None
     
     try:
-        audio = mutagen.File(file_path)
+        # Known extensions go straight to their format class; autodetect
+        # only for unknown or mislabeled files
+        kind = mutagen_dispatch.get(file_path.suffix.lower())
+        audio = mutagen.File(file_path, options=[kind]) if kind else None
+        if audio is None:
+            audio = mutagen.File(file_path)
         if audio is None:
             return None
         
@@ -745,6 +791,7 @@ class Extractor:
         self,
         max_excerpt_bytes: int = DEFAULT_MAX_EXCERPT_BYTES,
         max_pdf_pages: int = DEFAULT_MAX_PDF_PAGES,
+        cache_size: int = DEFAULT_CACHE_SIZE,
     ):
         """
         Initialize Extractor with configuration.
@@ -752,15 +799,25 @@ class Extractor:
         Args:
             max_excerpt_bytes: Maximum excerpt size (default 8KB)
             max_pdf_pages: Maximum PDF pages to extract (default 5)
+            cache_size: Extraction results kept for duplicate files (LRU)
         """
         self.max_excerpt_bytes = max_excerpt_bytes
         self.max_pdf_pages = max_pdf_pages
         
+        # Extraction results by (content hash, extension): duplicates are
+        # read once. The extension is part of the key because both the
+        # MIME type and the extractor used depend on it
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[str, Optional[str]]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        
         # Statistics tracking
         self.stats = {
             "files_processed": 0,
             "extraction_errors": 0,
             "total_excerpt_bytes": 0,
+            "cache_hits": 0,
         }
 
     def _reset_stats(self) -> None:
@@ -769,8 +826,14 @@ class Extractor:
             "files_processed": 0,
             "extraction_errors": 0,
             "total_excerpt_bytes": 0,
+            "cache_hits": 0,
         }
 
+    def _count(self, stat: str, amount: int = 1) -> None:
+        """Increment a stats counter (safe across extract_many threads)."""
+        with self._stats_lock:
+            self.stats[stat] += amount
+
     def _extract_content(self, file_path: Path, extension: str) -> Optional[str]:
         """
         Extract content based on file type.
@@ -827,42 +890,67 @@ class Extractor:
         # Unsupported format
         return None
 
+    def _cache_get(
+        self, key: Tuple[str, str]
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """Return a cached extraction result, marking it recently used."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+            return cached
+
+    def _cache_put(
+        self, key: Tuple[str, str], value: Tuple[str, Optional[str]]
+    ) -> None:
+        """Store an extraction result, evicting the least recently used."""
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
     def extract(self, record: FileRecord) -> FileRecord:
         """
         Extract content and enrich FileRecord.
 
+        Records whose sha256 and extension were already seen by this
+        Extractor reuse the earlier result instead of re-reading the file.
+
         Args:
             record: FileRecord to enrich
 
         Returns:
             New FileRecord with content_excerpt and mime fields
         """
-        self.stats["files_processed"] += 1
-        
-        # Detect MIME type
-        mime = detect_mime_type(record.path)
-        
-        # Extract content
-        try:
-            content = self._extract_content(record.path, record.extension)
+        self._count("files_processed")
+        
+        cache_key = (record.sha256, record.extension) if record.sha256 else None
+        cached = self._cache_get(cache_key) if cache_key else None
+        if cached is not None:
+            self._count("cache_hits")
+            mime, content = cached
+        else:
+            # Detect MIME type
+            mime = detect_mime_type(record.path)
             
-            if content:
-                self.stats["total_excerpt_bytes"] += len(content.encode("utf-8"))
-        except Exception as e:
-            logger.warning(f"Extraction error for {record.path}: {e}")
-            self.stats["extraction_errors"] += 1
-            content = None
-        
-        # Create enriched record (immutable pattern)
-        return FileRecord(
-            path=record.path,
-            size=record.size,
-            mtime=record.mtime,
-            ctime=record.ctime,
-            sha256=record.sha256,
-            extension=record.extension,
-            mime=mime,
-            content_excerpt=content,
+            # Extract content
+            try:
+                content = self._extract_content(record.path, record.extension)
+                
+                if content:
+                    self._count("total_excerpt_bytes", len(content.encode("utf-8")))
+                if cache_key:
+                    self._cache_put(cache_key, (mime, content))
+            except Exception as e:
+                logger.warning(f"Extraction error for {record.path}: {e}")
+                self._count("extraction_errors")
+                content = None
+        
+        # Create enriched record (immutable pattern); the source record is
+        # already validated, so copy it instead of re-running validation
+        return record.model_copy(
+            update={"mime": mime, "content_excerpt": content}
         )
 
     def extract_batch(
@@ -887,3 +975,28 @@ class Extractor:
                 callback(i + 1, record.path)
             
             yield enriched
+
+    def extract_many(
+        self,
+        records: List[FileRecord],
+        workers: int = DEFAULT_EXTRACT_WORKERS,
+    ) -> List[FileRecord]:
+        """
+        Extract content for multiple FileRecords concurrently.
+
+        Most of the per-file cost for media is waiting on the ffprobe
+        subprocess (one input per process), so running several
+        extractions at once overlaps process startup and I/O.
+
+        Args:
+            records: List of FileRecords to process
+            workers: Maximum number of concurrent extractions
+
+        Returns:
+            Enriched FileRecords in the same order as records
+        """
+        if not records:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.extract, records))
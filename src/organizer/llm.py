@@ -22,7 +22,10 @@ Safety Features:
 """
 import json
 import re
+import hashlib
 import logging
+import threading
+from collections import defaultdict
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 import asyncio
@@ -30,6 +33,7 @@ from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import httpx
+from pydantic import ValidationError
 
 from src.organizer.models import FileRecord, Classification, ClassificationResult, VALID_CATEGORIES
 from ..settings_manager import get_settings_manager
@@ -50,21 +54,49 @@ DEFAULT_TIMEOUT = 60
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_MIN_CONFIDENCE = 85
 
+# Suggested small quantized model for the two-tier fast path
+DEFAULT_FAST_MODEL = "qwen2.5:3b-q4_K_M"
+
+# Prompt excerpt budget: prefill cost is linear in prompt tokens, so long
+# excerpts keep their head and tail only
+MAX_EXCERPT_CHARS = 1024
+EXCERPT_HEAD_CHARS = 800
+EXCERPT_TAIL_CHARS = 200
+
 
 # =============================================================================
-# Prompt Templates
+# Response Schema
 # =============================================================================
 
-CLASSIFICATION_PROMPT_TEMPLATE = """You are a file organization assistant. Analyze the following file and classify it into the appropriate category.
+# JSON schema passed as Ollama's "format" so decoding is constrained to a
+# valid classification object (Ollama >= 0.5). Older servers ignore it and
+# the retry/correction loop still applies.
+CLASSIFICATION_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "categoria": {"type": "string", "enum": sorted(VALID_CATEGORIES)},
+        "subcategoria": {"type": "string"},
+        "assunto": {"type": "string"},
+        "ano": {"type": "integer", "minimum": 1900, "maximum": 2100},
+        "nome_sugerido": {"type": "string"},
+        "confianca": {"type": "integer", "minimum": 0, "maximum": 100},
+        "racional": {"type": "string"},
+    },
+    "required": [
+        "categoria", "subcategoria", "assunto",
+        "ano", "nome_sugerido", "confianca", "racional",
+    ],
+}
 
-## File Information
-- **Filename**: {filename}
-- **Extension**: {extension}
-- **Size**: {size} bytes
-- **Modified Date**: {mtime}
 
-## Content Excerpt
-{content_excerpt}
+# =============================================================================
+# Prompt Templates
+# =============================================================================
+
+# Static part of the prompt, sent as Ollama's "system" message. It is
+# byte-identical for every file, so the server can reuse the KV cache of
+# this prefix instead of re-running prefill on it for each request.
+CLASSIFICATION_SYSTEM_PROMPT = """You are a file organization assistant. Analyze the file described by the user and classify it into the appropriate category.
 
 ## Valid Categories
 {categories}
@@ -89,7 +121,19 @@ Respond ONLY with a valid JSON object in this exact format:
 }}
 ```
 
-Respond with valid JSON only. No additional text."""
+Respond with valid JSON only. No additional text.""".format(
+    categories="\n".join(f"- {cat}" for cat in sorted(VALID_CATEGORIES))
+)
+
+# Per-file part of the prompt
+FILE_PROMPT_TEMPLATE = """## File Information
+- **Filename**: {filename}
+- **Extension**: {extension}
+- **Size**: {size} bytes
+- **Modified Date**: {mtime}
+
+## Content Excerpt
+{content_excerpt}"""
 
 CORRECTION_PROMPT_TEMPLATE = """Your previous response was invalid. Please try again.
 
@@ -118,34 +162,68 @@ Respond with valid JSON only."""
 # Helper Functions
 # =============================================================================
 
-def build_classification_prompt(record: FileRecord) -> str:
+def trim_excerpt(content: str) -> str:
     """
-    Build classification prompt for LLM.
+    Bound an excerpt to MAX_EXCERPT_CHARS for the prompt.
+    
+    Keeps the beginning (titles, headers) and the end (totals,
+    signatures) of long content.
     
     Args:
-        record: FileRecord to classify
+        content: Excerpt text
     
     Returns:
-        Formatted prompt string
+        Content unchanged if short enough, otherwise head + marker + tail
+    """
+    if len(content) <= MAX_EXCERPT_CHARS:
+        return content
+    return (
+        content[:EXCERPT_HEAD_CHARS]
+        + "\n[...]\n"
+        + content[-EXCERPT_TAIL_CHARS:]
+    )
+
+
+def build_file_prompt(record: FileRecord) -> str:
     """
-    # Format categories with descriptions
-    categories_str = "\n".join([f"- {cat}" for cat in VALID_CATEGORIES])
+    Build the per-file part of the classification prompt.
+    
+    Meant to be sent together with CLASSIFICATION_SYSTEM_PROMPT as the
+    system message.
+    
+    Args:
+        record: FileRecord to classify
     
+    Returns:
+        Formatted prompt string with file metadata and excerpt
+    """
     # Format content excerpt
-    content = record.content_excerpt or "(No content extracted)"
-    if len(content) > 2000:
-        content = content[:2000] + "\n[TRUNCATED]"
+    content = trim_excerpt(record.content_excerpt or "(No content extracted)")
     
-    return CLASSIFICATION_PROMPT_TEMPLATE.format(
+    return FILE_PROMPT_TEMPLATE.format(
         filename=record.path.name,
         extension=record.extension,
         size=record.size,
         mtime=record.mtime.strftime("%Y-%m-%d %H:%M:%S"),
         content_excerpt=content,
-        categories=categories_str,
     )
 
 
+def build_classification_prompt(record: FileRecord) -> str:
+    """
+    Build the full single-message classification prompt for LLM.
+    
+    Used by backends without a separate system message.
+    
+    Args:
+        record: FileRecord to classify
+    
+    Returns:
+        Formatted prompt string
+    """
+    return f"{CLASSIFICATION_SYSTEM_PROMPT}\n\n{build_file_prompt(record)}"
+
+
 def build_correction_prompt(
     record: FileRecord,
     error: str
@@ -166,7 +244,7 @@ def build_correction_prompt(
     
     return CORRECTION_PROMPT_TEMPLATE.format(
         error=error,
-        categories=", ".join(VALID_CATEGORIES),
+        categories=", ".join(sorted(VALID_CATEGORIES)),
         filename=record.path.name,
         content_excerpt=content,
     )
@@ -262,7 +340,7 @@ def validate_classification_json(data: Dict) -> Tuple[bool, List[str]]:
     if data["categoria"] not in VALID_CATEGORIES:
         errors.append(
             f"Invalid categoria: {data['categoria']}. "
-            f"Must be one of: {VALID_CATEGORIES}"
+            f"Must be one of: {sorted(VALID_CATEGORIES)}"
         )
     
     # Validate confianca range
@@ -284,6 +362,50 @@ def validate_classification_json(data: Dict) -> Tuple[bool, List[str]]:
     return len(errors) == 0, errors
 
 
+def _excerpt_key(record: FileRecord) -> Optional[bytes]:
+    """
+    Dedup key for batch classification.
+    
+    Files with identical content excerpts (templates, duplicated invoices)
+    share one LLM call. Files without an excerpt are never grouped, since
+    the filename is then the only signal the model has.
+    
+    Args:
+        record: FileRecord to key
+    
+    Returns:
+        16-byte digest of the excerpt, or None if there is no excerpt
+    """
+    if not record.content_excerpt:
+        return None
+    return hashlib.blake2s(
+        record.content_excerpt.encode("utf-8"), digest_size=16
+    ).digest()
+
+
+def _broadcast_classification(
+    classification: Classification,
+    record: FileRecord,
+) -> Classification:
+    """
+    Reuse a classification for another file with the same excerpt.
+    
+    The suggested name is rebuilt from the target record so that
+    duplicates keep their own date and extension.
+    
+    Args:
+        classification: Classification obtained for the group leader
+        record: FileRecord receiving the shared result
+    
+    Returns:
+        Copy of the classification with a record-specific nome_sugerido
+    """
+    date_str = record.mtime.strftime("%Y-%m-%d")
+    subject = (classification.assunto or record.path.stem)[:50].replace(" ", "_")
+    nome_sugerido = f"{date_str}__{classification.categoria}__{subject}{record.extension}"
+    return classification.model_copy(update={"nome_sugerido": nome_sugerido})
+
+
 # =============================================================================
 # Ollama Client
 # =============================================================================
@@ -298,6 +420,7 @@ class OllamaClient:
         base_url: Ollama server URL
         model: Model to use for generation
         timeout: Request timeout in seconds
+        stream: Stream tokens and stop at the first complete JSON object
     """
     
     def __init__(
@@ -305,6 +428,7 @@ class OllamaClient:
         base_url: str = DEFAULT_BASE_URL,
         model: str = DEFAULT_MODEL,
         timeout: int = DEFAULT_TIMEOUT,
+        stream: bool = False,
     ):
         """
         Initialize Ollama client.
@@ -313,10 +437,13 @@ class OllamaClient:
             base_url: Ollama server URL
             model: Model name (e.g., "qwen2.5:14b")
             timeout: Request timeout in seconds
+            stream: Stream the response and close the connection as soon
+                as a complete JSON object has been received
         """
         self.base_url = base_url.rstrip("/")
         self.model = model
         self.timeout = timeout
+        self.stream = stream
     
     def health_check(self) -> bool:
         """
@@ -340,6 +467,7 @@ class OllamaClient:
         prompt: str,
         system: Optional[str] = None,
         temperature: float = 0.1,
+        output_format: Optional[Any] = None,
     ) -> Optional[str]:
         """
         Generate text completion.
@@ -348,6 +476,7 @@ class OllamaClient:
             prompt: Input prompt
             system: Optional system message
             temperature: Sampling temperature (lower = more deterministic)
+            output_format: Optional "json" or JSON schema to constrain decoding
         
         Returns:
             Generated text or None on error
@@ -355,7 +484,7 @@ class OllamaClient:
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": self.stream,
             "options": {
                 "temperature": temperature,
             }
@@ -364,6 +493,12 @@ class OllamaClient:
         if system:
             payload["system"] = system
         
+        if output_format is not None:
+            payload["format"] = output_format
+        
+        if self.stream:
+            return self._generate_streaming(payload)
+        
         try:
             response = requests.post(
                 f"{self.base_url}/api/generate",
@@ -382,6 +517,54 @@ class OllamaClient:
         except Exception as e:
             logger.error(f"Ollama request error: {e}")
             return None
+    
+    def _generate_streaming(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Stream a generation, stopping at the first complete JSON object.
+        
+        Models often append explanations after the JSON answer; closing
+        the connection early stops the server from decoding them.
+        
+        Args:
+            payload: Request payload with "stream" enabled
+        
+        Returns:
+            Text received so far or None on error
+        """
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=self.timeout,
+                stream=True,
+            )
+            
+            if response.status_code != 200:
+                logger.error(
+                    f"Ollama generate failed: {response.status_code} - {response.text}"
+                )
+                return None
+            
+            text = ""
+            try:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    piece = chunk.get("response", "")
+                    text += piece
+                    if chunk.get("done"):
+                        break
+                    # Only try parsing once an object may have closed
+                    if "}" in piece and parse_llm_response(text) is not None:
+                        break
+            finally:
+                response.close()
+            
+            return text
+        except Exception as e:
+            logger.error(f"Ollama request error: {e}")
+            return None
 
 
 # =============================================================================
@@ -410,6 +593,8 @@ class LLMClassifier:
         min_confidence: int = DEFAULT_MIN_CONFIDENCE,
         max_retries: int = DEFAULT_MAX_RETRIES,
         backend: str = "ollama",
+        fast_model: Optional[str] = None,
+        escalate_below: Optional[int] = None,
         **kwargs
     ):
         """
@@ -418,9 +603,26 @@ class LLMClassifier:
         Args:
             backend: "ollama", "gemini", or "openai" (from CLI flag)
             model: Override default model from settings
+            fast_model: Optional small model tried first (e.g. DEFAULT_FAST_MODEL);
+                only answers below escalate_below are re-run on the main model
+            escalate_below: Confidence gate for escalation (default: min_confidence)
             **kwargs: Additional overrides (batch_size, timeout, etc.)
         """
         self.backend = backend
+        self.min_confidence = min_confidence
+        self.max_retries = max_retries
+        self.escalate_below = (
+            escalate_below if escalate_below is not None else min_confidence
+        )
+        self.fast_client: Optional[OllamaClient] = None
+        self.stats = {
+            "successful": 0,
+            "failed": 0,
+            "retries": 0,
+            "low_confidence": 0,
+            "escalations": 0,
+        }
+        self._stats_lock = threading.Lock()
         settings = get_settings_manager()
         
         # Load backend config from settings.yaml
@@ -440,6 +642,29 @@ class LLMClassifier:
             logger.info(f"🚀 Ollama: {self.base_url}, model={self.model}, "
                        f"batch={self.batch_size}, concurrent={self.max_concurrent}")
             
+            self.stream = backend_config.get("stream", False)
+            
+            self.client = OllamaClient(
+                base_url=self.base_url,
+                model=self.model,
+                timeout=self.timeout,
+                stream=self.stream,
+            )
+            
+            # Optional two-tier strategy: quantized model first
+            self.fast_model = fast_model or backend_config.get("fast_model")
+            if self.fast_model:
+                self.fast_client = OllamaClient(
+                    base_url=self.base_url,
+                    model=self.fast_model,
+                    timeout=self.timeout,
+                    stream=self.stream,
+                )
+                logger.info(
+                    f"⚡ Fast path: {self.fast_model} "
+                    f"(escalate below {self.escalate_below})"
+                )
+            
             self._verify_ollama()
             
         elif backend == "gemini":
@@ -491,70 +716,172 @@ class LLMClassifier:
         
         return gpu_config
 
-    def classify(self, record: FileRecord) -> Optional[Classification]:
+    def _verify_ollama(self) -> None:
+        """Warn early if the Ollama server is not reachable."""
+        if not self.client.health_check():
+            logger.warning(
+                f"Ollama not reachable at {self.base_url}. "
+                f"Start it with 'ollama serve' before classifying."
+            )
+
+    def _count(self, stat: str) -> None:
+        """Increment a stats counter (safe across classify_many threads)."""
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    def _fallback_result(self, record: FileRecord, error: str) -> ClassificationResult:
+        """Route a file that could not be classified to the inbox."""
+        return ClassificationResult(
+            categoria="90_Inbox_Organizar",
+            subcategoria="",
+            assunto="",
+            ano=record.mtime.year,
+            nome_sugerido=record.path.name,
+            confianca=0,
+            racional=f"Classification failed: {error}",
+        )
+
+    def _build_prompt(self, record: FileRecord) -> str:
+        """Build the classification prompt for the async backends."""
+        return build_classification_prompt(record)
+
+    def _parse_json_response(self, response: str) -> Dict:
+        """Parse an LLM response, raising ValueError if no JSON is found."""
+        data = parse_llm_response(response)
+        if data is None:
+            raise ValueError("Could not parse JSON from response")
+        return data
+
+    def _request_classification(
+        self,
+        client: OllamaClient,
+        record: FileRecord,
+    ) -> Tuple[Optional[Classification], str]:
         """
-        Classify a FileRecord using LLM.
+        Ask one model for a classification, retrying on invalid responses.
         
         Args:
+            client: OllamaClient to query
             record: FileRecord to classify
         
         Returns:
-            Classification if successful, None otherwise
+            Tuple of (validated Classification or None, last error message)
         """
-        prompt = build_classification_prompt(record)
+        prompt = build_file_prompt(record)
         last_error = "Invalid JSON response"
         
         for attempt in range(self.max_retries):
             # Use correction prompt on retries
             if attempt > 0:
                 prompt = build_correction_prompt(record, last_error)
-                self.stats["retries"] += 1
+                self._count("retries")
             
-            # Get LLM response
-            response = self.client.generate(prompt)
+            # Get LLM response (schema-constrained to valid JSON)
+            response = client.generate(
+                prompt,
+                system=CLASSIFICATION_SYSTEM_PROMPT,
+                output_format=CLASSIFICATION_SCHEMA,
+            )
             
             if not response:
                 last_error = "No response from LLM"
                 continue
             
-            # Parse JSON
-            data = parse_llm_response(response)
-            
-            if not data:
-                last_error = "Could not parse JSON from response"
+            # Parse, validate and build in one pass
+            try:
+                classification = Classification.from_llm_json(response)
+            except ValidationError as e:
+                last_error = "; ".join(
+                    f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                    for err in e.errors()
+                )
                 continue
-            
-            # Validate
-            is_valid, errors = validate_classification_json(data)
-            
-            if not is_valid:
-                last_error = "; ".join(errors)
+            except ValueError as e:
+                last_error = str(e)
                 continue
             
-            # Check confidence
-            confianca = int(data["confianca"])
-            
-            if confianca < self.min_confidence:
-                self.stats["low_confidence"] += 1
-                # Route to inbox or return None
+            if not classification.nome_sugerido:
+                classification = classification.model_copy(
+                    update={"nome_sugerido": record.path.name}
+                )
+            return classification, last_error
+        
+        return None, last_error
+
+    def classify(self, record: FileRecord) -> Optional[Classification]:
+        """
+        Classify a FileRecord using LLM.
+        
+        When a fast model is configured it answers first; the main model
+        is only used if the fast answer is invalid or below escalate_below.
+        
+        Args:
+            record: FileRecord to classify
+        
+        Returns:
+            Classification if successful, None otherwise
+        """
+        classification = None
+        
+        if self.fast_client is not None:
+            classification, _ = self._request_classification(self.fast_client, record)
+            if classification is None or classification.confianca < self.escalate_below:
+                self._count("escalations")
+                classification = None
+        
+        if classification is None:
+            classification, last_error = self._request_classification(self.client, record)
+        
+            if classification is None:
+                # All retries exhausted
+                self._count("failed")
+                logger.warning(
+                    f"Classification failed for {record.path.name} after "
+                    f"{self.max_retries} attempts: {last_error}"
+                )
                 return None
-            
-            # Success!
-            self.stats["successful"] += 1
-            return self._create_classification(record, data)
-        
-        # All retries exhausted
-        self.stats["failed"] += 1
-        logger.warning(
-            f"Classification failed for {record.path.name} after "
-            f"{self.max_retries} attempts: {last_error}"
-        )
-        return None
+        
+        # Check confidence
+        if classification.confianca < self.min_confidence:
+            self._count("low_confidence")
+            # Route to inbox or return None
+            return None
+        
+        # Success!
+        self._count("successful")
+        return classification
+    
+    def classify_many(
+        self,
+        records: List[FileRecord],
+        workers: int = 8,
+    ) -> List[Optional[Classification]]:
+        """
+        Classify several files concurrently with the synchronous client.
+        
+        Threads block on the HTTP call while Ollama batches the pending
+        requests server-side (see OLLAMA_NUM_PARALLEL).
+        
+        Args:
+            records: FileRecords to classify
+            workers: Maximum number of in-flight requests
+        
+        Returns:
+            Classifications (or None) in the same order as records
+        """
+        if not records:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.classify, records))
     
     async def classify_batch(self, files: List[FileRecord]) -> List[ClassificationResult]:
         """
         🔥 NOVO: Classifica múltiplos arquivos em paralelo para maximizar GPU
         
+        Arquivos com o mesmo content_excerpt são enviados ao LLM uma única
+        vez; o resultado é replicado para os demais do grupo.
+        
         Args:
             files: Lista de arquivos a classificar
             
@@ -563,8 +890,17 @@ class LLMClassifier:
         """
         if not files:
             return []
-            
-        logger.info(f"Processando batch de {len(files)} arquivos (concorrência: {self.max_concurrent})")
+        
+        # Agrupa por excerpt: uma inferência por conteúdo único
+        groups: Dict[Any, List[int]] = defaultdict(list)
+        for i, file_record in enumerate(files):
+            key = _excerpt_key(file_record)
+            groups[key if key is not None else i].append(i)
+        
+        logger.info(
+            f"Processando batch de {len(files)} arquivos "
+            f"({len(groups)} únicos, concorrência: {self.max_concurrent})"
+        )
         
         # Cria semáforo para controlar concorrência
         semaphore = asyncio.Semaphore(self.max_concurrent)
@@ -574,17 +910,22 @@ class LLMClassifier:
                 return await self._classify_single(file_record)
         
         # Processa todos em paralelo (respeitando semáforo)
-        tasks = [classify_with_semaphore(f) for f in files]
+        tasks = [classify_with_semaphore(files[idxs[0]]) for idxs in groups.values()]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Converte exceções em resultados de erro
-        final_results = []
-        for i, result in enumerate(results):
+        # Converte exceções em resultados de erro e replica para o grupo
+        final_results: List[Optional[ClassificationResult]] = [None] * len(files)
+        for idxs, result in zip(groups.values(), results):
+            leader = idxs[0]
             if isinstance(result, Exception):
-                logger.error(f"Erro no arquivo {files[i].path}: {result}")
-                final_results.append(self._fallback_result(files[i], str(result)))
-            else:
-                final_results.append(result)
+                logger.error(f"Erro no arquivo {files[leader].path}: {result}")
+                for i in idxs:
+                    final_results[i] = self._fallback_result(files[i], str(result))
+                continue
+            
+            final_results[leader] = result
+            for i in idxs[1:]:
+                final_results[i] = _broadcast_classification(result, files[i])
         
         return final_results
 
@@ -601,7 +942,7 @@ class LLMClassifier:
 
     async def _classify_ollama(self, file_record: FileRecord) -> ClassificationResult:
         """Classifica via Ollama com retry e timeout"""
-        prompt = self._build_prompt(file_record)
+        prompt = build_file_prompt(file_record)
         
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             for attempt in range(3):  # 3 tentativas
@@ -611,6 +952,7 @@ class LLMClassifier:
                         json={
                             "model": self.model,
                             "prompt": prompt,
+                            "system": CLASSIFICATION_SYSTEM_PROMPT,
                             "format": "json",  # Força JSON puro
                             "stream": False,
                             "options": {
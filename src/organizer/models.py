@@ -7,25 +7,39 @@ These models define the core data structures used throughout the pipeline:
 - PlanItem: Single action in execution plan
 - ExecutionResult: Result of executing a PlanItem
 
-All models use Pydantic for validation and serialization.
+All models use Pydantic for validation and serialization. Instances are
+frozen: use model_copy(update=...) to derive a modified record.
 """
 from pathlib import Path
 from datetime import datetime
-from typing import Literal, Optional, Any
-from pydantic import BaseModel, Field, field_validator, model_validator
+from enum import StrEnum
+from typing import Literal, Optional, Any, Dict, FrozenSet, List
+import pydantic_core
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 # =============================================================================
 # Constants
 # =============================================================================
 
-VALID_CATEGORIES = [
-    "01_Trabalho",
-    "02_Financas",
-    "03_Estudos",
-    "04_Livros",
-    "05_Pessoal",
-    "90_Inbox_Organizar"
-]
+class Category(StrEnum):
+    """
+    Closed set of top-level categories.
+    
+    Members are singletons that compare and hash equal to their folder
+    name, so plain strings keep working everywhere (paths, dict keys,
+    JSON) while in-memory classifications share one object per category.
+    """
+    TRABALHO = "01_Trabalho"
+    FINANCAS = "02_Financas"
+    ESTUDOS = "03_Estudos"
+    LIVROS = "04_Livros"
+    PESSOAL = "05_Pessoal"
+    INBOX = "90_Inbox_Organizar"
+
+
+# Frozenset for O(1) membership checks; use sorted(VALID_CATEGORIES) when
+# a stable order is needed (prompts, schemas, messages)
+VALID_CATEGORIES: FrozenSet[str] = frozenset(c.value for c in Category)
 
 VALID_ACTIONS = ["MOVE", "RENAME", "COPY", "SKIP"]
 
@@ -34,6 +48,50 @@ MIN_YEAR = 1900
 MAX_YEAR = 2100
 
 
+# =============================================================================
+# Helpers
+# =============================================================================
+
+def _slice_json_object(text: str) -> Optional[str]:
+    """
+    Return the first balanced {...} object in text.
+    
+    Skips markdown fences or prose around the JSON without parsing it;
+    braces inside JSON strings are ignored.
+    
+    Args:
+        text: Raw LLM output
+    
+    Returns:
+        JSON object substring, or None if there is no complete object
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
 # =============================================================================
 # FileRecord Model
 # =============================================================================
@@ -51,7 +109,7 @@ class FileRecord(BaseModel):
         mtime: Last modification time
         ctime: Creation time
         sha256: SHA256 hash of file contents
-        extension: File extension (normalized to lowercase)
+        extension: File extension (lowercased by the Scanner at ingest)
         mime: MIME type of the file (optional, set by Extractor)
         content_excerpt: Optional extracted content (max 8KB)
     """
@@ -64,19 +122,12 @@ class FileRecord(BaseModel):
     mime: Optional[str] = None
     content_excerpt: Optional[str] = None
     
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_encoders": {
-            Path: str,
-            datetime: lambda v: v.isoformat()
-        }
-    }
-    
-    @field_validator('extension')
-    @classmethod
-    def normalize_extension(cls, v: str) -> str:
-        """Normalize extension to lowercase."""
-        return v.lower()
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        validate_assignment=False,
+        arbitrary_types_allowed=True,
+    )
 
 
 # =============================================================================
@@ -91,7 +142,7 @@ class Classification(BaseModel):
     Used by the Planner to determine destination paths.
     
     Attributes:
-        categoria: Target category (must be in VALID_CATEGORIES)
+        categoria: Target category (accepts the folder name string)
         subcategoria: Subcategory within the main category
         assunto: Brief description of the content
         ano: Year for organization (1900-2100)
@@ -99,7 +150,7 @@ class Classification(BaseModel):
         confianca: Confidence score (0-100)
         racional: Explanation of the classification
     """
-    categoria: str
+    categoria: Category
     subcategoria: str
     assunto: str
     ano: int = Field(ge=MIN_YEAR, le=MAX_YEAR)
@@ -110,15 +161,35 @@ class Classification(BaseModel):
     # Optional: rule_id if classified by rule engine
     rule_id: Optional[str] = None
     
-    @field_validator('categoria')
+    # LLM output may carry extra keys; drop them rather than reject
+    model_config = ConfigDict(
+        frozen=True,
+        extra="ignore",
+        validate_assignment=False,
+    )
+    
     @classmethod
-    def validate_categoria(cls, v: str) -> str:
-        """Ensure categoria is one of the valid categories."""
-        if v not in VALID_CATEGORIES:
-            raise ValueError(
-                f"categoria must be one of {VALID_CATEGORIES}, got '{v}'"
-            )
-        return v
+    def from_llm_json(cls, text: str) -> "Classification":
+        """
+        Parse and validate raw LLM output in a single pass.
+        
+        The JSON object is sliced out of the text and handed straight to
+        pydantic's JSON validator, with no intermediate dict.
+        
+        Args:
+            text: Raw LLM response (may include fences or extra prose)
+        
+        Returns:
+            Validated Classification
+        
+        Raises:
+            ValueError: If no JSON object is found or validation fails
+                (pydantic's ValidationError is a ValueError)
+        """
+        payload = _slice_json_object(text or "")
+        if payload is None:
+            raise ValueError("Could not find a JSON object in response")
+        return cls.model_validate_json(payload)
 
 
 # =============================================================================
@@ -151,12 +222,12 @@ class PlanItem(BaseModel):
     rule_id: Optional[str] = None
     llm_used: bool = False
     
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_encoders": {
-            Path: str
-        }
-    }
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        validate_assignment=False,
+        arbitrary_types_allowed=True,
+    )
     
     @model_validator(mode='after')
     def validate_dst_for_action(self) -> 'PlanItem':
@@ -165,6 +236,26 @@ class PlanItem(BaseModel):
             # Allow None dst for SKIP, warn for others
             pass  # We allow this for flexibility, planner should set dst
         return self
+    
+    @classmethod
+    def validate_many(cls, items: List[Dict[str, Any]]) -> List["PlanItem"]:
+        """
+        Validate a list of raw dicts (e.g. a loaded plan) in one call.
+        
+        Uses a module-level TypeAdapter built once, so the whole list is
+        validated inside pydantic-core instead of one constructor call
+        per item.
+        
+        Args:
+            items: PlanItem field dicts (paths may be strings)
+        
+        Returns:
+            List of validated PlanItems
+        """
+        return _PLAN_ITEM_LIST_ADAPTER.validate_python(items)
+
+
+_PLAN_ITEM_LIST_ADAPTER = TypeAdapter(List[PlanItem])
 
 
 # =============================================================================
@@ -188,13 +279,53 @@ class ExecutionResult(BaseModel):
     error: Optional[str] = None
     timestamp: datetime = Field(default_factory=datetime.now)
     
-    model_config = {
-        "arbitrary_types_allowed": True,
-        "json_encoders": {
-            Path: str,
-            datetime: lambda v: v.isoformat()
-        }
-    }
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        validate_assignment=False,
+        arbitrary_types_allowed=True,
+    )
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+# Serializes models (and containers of models) by their runtime type
+_JSON_ADAPTER = TypeAdapter(Any)
+
+
+def to_json(obj: Any, indent: Optional[int] = None) -> bytes:
+    """
+    Encode models, or dicts/lists containing models, to JSON bytes.
+    
+    Runs entirely in pydantic-core: no intermediate model_dump() dicts
+    and no json.dumps pass. Paths and datetimes become strings.
+    
+    Args:
+        obj: Model instance or plain container holding models
+        indent: Optional indentation for human-readable output
+    
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return _JSON_ADAPTER.dump_json(obj, indent=indent)
+
+
+def from_json(data: bytes) -> Any:
+    """
+    Decode JSON bytes into plain Python objects with pydantic-core.
+    
+    Counterpart of to_json for documents that are post-processed before
+    validation (e.g. saved plans).
+    
+    Args:
+        data: UTF-8 encoded JSON
+    
+    Returns:
+        Decoded dicts/lists/scalars
+    """
+    return pydantic_core.from_json(data)
 
 
 # =============================================================================
@@ -210,6 +341,9 @@ __all__ = [
     "ClassificationResult",  # Alias
     "PlanItem",
     "ExecutionResult",
+    "Category",
+    "to_json",
+    "from_json",
     "VALID_CATEGORIES",
     "VALID_ACTIONS"
 ]
@@ -16,14 +16,15 @@ Safety Features:
 - Human-readable plan preview (Markdown)
 - Machine-readable plan (JSON) for execution
 """
-import json
+import os
 import re
 import logging
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
-from src.organizer.models import FileRecord, Classification, PlanItem
+from src.organizer.models import FileRecord, Classification, PlanItem, from_json, to_json
 
 
 # Configure logging
@@ -37,11 +38,18 @@ logger = logging.getLogger(__name__)
 MAX_FILENAME_LENGTH = 200
 INVALID_CHARS = r'[<>:"/\\|?*]'
 
+# Same character set as INVALID_CHARS, as a str.translate table
+_SANITIZE_TABLE = str.maketrans(dict.fromkeys('<>:"/\\|?*', "_"))
+
+# Windows filesystems are case-insensitive; compare names the same way
+_name_key: Callable[[str], str] = str.casefold if os.name == "nt" else str
+
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+@lru_cache(maxsize=4096)
 def sanitize_filename(name: str, max_length: int = MAX_FILENAME_LENGTH) -> str:
     """
     Sanitize filename for Windows compatibility.
@@ -53,11 +61,12 @@ def sanitize_filename(name: str, max_length: int = MAX_FILENAME_LENGTH) -> str:
     Returns:
         Sanitized filename
     """
-    # Remove invalid characters
-    sanitized = re.sub(INVALID_CHARS, "_", name)
+    # Replace invalid characters (single C-level pass)
+    sanitized = name.translate(_SANITIZE_TABLE)
     
     # Replace multiple underscores with single
-    sanitized = re.sub(r"_+", "_", sanitized)
+    while "__" in sanitized:
+        sanitized = sanitized.replace("__", "_")
     
     # Truncate if needed, preserving extension
     if len(sanitized) > max_length:
@@ -73,32 +82,36 @@ def sanitize_filename(name: str, max_length: int = MAX_FILENAME_LENGTH) -> str:
     return sanitized
 
 
+def _split_version(stem: str) -> Tuple[str, int]:
+    """Split "name_v3" into ("name", 3); unversioned stems are version 1."""
+    version_match = re.search(r"_v(\d+)$", stem)
+    if version_match:
+        return stem[:version_match.start()], int(version_match.group(1))
+    return stem, 1
+
+
 def resolve_naming_conflict(dest_path: Path) -> Path:
     """
     Resolve naming conflict by adding version suffix.
     
+    Stateless: only the filesystem is consulted. Planner.resolve is the
+    batch-aware variant that also keeps names handed out earlier in the
+    same plan apart.
+    
     Args:
         dest_path: Desired destination path
     
     Returns:
         Conflict-free path with version suffix if needed
     """
-    if not dest_path.exists():
+    # lexists: a dangling symlink still occupies the name
+    if not os.path.lexists(dest_path):
         return dest_path
     
     # Extract stem and extension
-    stem = dest_path.stem
     ext = dest_path.suffix
     parent = dest_path.parent
-    
-    # Check for existing version suffix
-    version_match = re.search(r"_v(\d+)$", stem)
-    if version_match:
-        base_stem = stem[:version_match.start()]
-        current_version = int(version_match.group(1))
-    else:
-        base_stem = stem
-        current_version = 1
+    base_stem, current_version = _split_version(dest_path.stem)
     
     # Find next available version
     while True:
@@ -106,7 +119,7 @@ def resolve_naming_conflict(dest_path: Path) -> Path:
         new_name = f"{base_stem}_v{current_version}{ext}"
         new_path = parent / new_name
         
-        if not new_path.exists():
+        if not os.path.lexists(new_path):
             return new_path
         
         # Safety limit
@@ -116,6 +129,22 @@ def resolve_naming_conflict(dest_path: Path) -> Path:
             return parent / f"{base_stem}_{timestamp}{ext}"
 
 
+@lru_cache(maxsize=4096)
+def _build_dest_dir(
+    base_path: Path,
+    categoria: str,
+    subcategoria: str,
+    ano: int,
+) -> Path:
+    """Build base_path/categoria[/subcategoria]/ano (memoized)."""
+    dest_dir = base_path / categoria
+    
+    if subcategoria:
+        dest_dir = dest_dir / subcategoria
+    
+    return dest_dir / str(ano)
+
+
 def build_destination_path(
     base_path: Path,
     record: FileRecord,
@@ -134,13 +163,13 @@ def build_destination_path(
     Returns:
         Full destination path
     """
-    # Build directory structure
-    dest_dir = base_path / classification.categoria
-    
-    if classification.subcategoria:
-        dest_dir = dest_dir / classification.subcategoria
-    
-    dest_dir = dest_dir / str(classification.ano)
+    # Build directory structure (shared by every file in the same folder)
+    dest_dir = _build_dest_dir(
+        base_path,
+        classification.categoria,
+        classification.subcategoria,
+        classification.ano,
+    )
     
     # Use suggested name or generate one
     if classification.nome_sugerido:
@@ -156,15 +185,18 @@ def build_destination_path(
     return dest_dir / filename
 
 
-def create_plan_item(
+def plan_item_fields(
     record: FileRecord,
     classification: Optional[Classification],
     base_path: Path,
     action: str = "MOVE",
     llm_used: bool = False,
-) -> PlanItem:
+    resolve: Callable[[Path], Path] = resolve_naming_conflict,
+) -> Dict[str, Any]:
     """
-    Create a PlanItem from FileRecord and Classification.
+    Compute PlanItem fields without building the model.
+    
+    Lets callers validate many items at once (PlanItem.validate_many).
     
     Args:
         record: Source FileRecord
@@ -172,34 +204,60 @@ def create_plan_item(
         base_path: Base directory for organized files
         action: Action type (MOVE, COPY, SKIP)
         llm_used: Whether LLM was used for classification
+        resolve: Naming conflict resolver (Planner.resolve within a run)
     
     Returns:
-        PlanItem object
+        Dict of PlanItem fields
     """
     if classification is None or action == "SKIP":
-        return PlanItem(
-            action="SKIP",
-            src=record.path,
-            dst=None,
-            reason="No classification available",
-            confidence=0,
-            llm_used=llm_used,
-        )
+        return {
+            "action": "SKIP",
+            "src": record.path,
+            "dst": None,
+            "reason": "No classification available",
+            "confidence": 0,
+            "llm_used": llm_used,
+        }
     
     # Build destination path
     dest_path = build_destination_path(base_path, record, classification)
     
     # Resolve conflicts if destination exists
-    dest_path = resolve_naming_conflict(dest_path)
+    dest_path = resolve(dest_path)
     
+    return {
+        "action": action,
+        "src": record.path,
+        "dst": dest_path,
+        "reason": classification.racional,
+        "confidence": classification.confianca,
+        "rule_id": None,  # Set by caller if rule-based
+        "llm_used": llm_used,
+    }
+
+
+def create_plan_item(
+    record: FileRecord,
+    classification: Optional[Classification],
+    base_path: Path,
+    action: str = "MOVE",
+    llm_used: bool = False,
+) -> PlanItem:
+    """
+    Create a PlanItem from FileRecord and Classification.
+    
+    Args:
+        record: Source FileRecord
+        classification: Classification result (None for SKIP)
+        base_path: Base directory for organized files
+        action: Action type (MOVE, COPY, SKIP)
+        llm_used: Whether LLM was used for classification
+    
+    Returns:
+        PlanItem object
+    """
     return PlanItem(
-        action=action,
-        src=record.path,
-        dst=dest_path,
-        reason=classification.racional,
-        confidence=classification.confianca,
-        rule_id=None,  # Set by caller if rule-based
-        llm_used=llm_used,
+        **plan_item_fields(record, classification, base_path, action, llm_used)
     )
 
 
@@ -217,6 +275,8 @@ class Planner:
         base_path: Base directory for organized files
         default_action: Default action (MOVE or COPY)
         stats: Planning statistics
+        assigned: Names taken per destination folder in the current run
+            (already on disk or handed out by this planner)
     """
     
     def __init__(
@@ -233,6 +293,7 @@ class Planner:
         """
         self.base_path = Path(base_path)
         self.default_action = default_action
+        self.assigned: Dict[Path, Set[str]] = {}
         
         # Statistics
         self.stats = {
@@ -249,6 +310,58 @@ class Planner:
             "by_category": {},
         }
     
+    def reset(self) -> None:
+        """Forget destination names assigned in the previous run."""
+        self.assigned.clear()
+    
+    def _taken_names(self, folder: Path) -> Set[str]:
+        """Names taken in folder; listed from disk once per run."""
+        names = self.assigned.get(folder)
+        if names is None:
+            try:
+                names = {_name_key(name) for name in os.listdir(folder)}
+            except OSError:
+                # Folder not created yet (or unreadable): nothing to clash with
+                names = set()
+            self.assigned[folder] = names
+        return names
+    
+    def resolve(self, dest_path: Path) -> Path:
+        """
+        Resolve naming conflicts using in-memory name sets.
+        
+        Each destination folder is listed once per run; after that every
+        probe is a set lookup instead of a stat() call. Names handed out
+        earlier in the run count as taken, so two files planned for the
+        same destination get distinct paths even before either exists.
+        
+        Args:
+            dest_path: Desired destination path
+        
+        Returns:
+            Conflict-free path with version suffix if needed
+        """
+        taken = self._taken_names(dest_path.parent)
+        
+        if _name_key(dest_path.name) in taken:
+            ext = dest_path.suffix
+            base_stem, version = _split_version(dest_path.stem)
+            
+            while True:
+                version += 1
+                dest_path = dest_path.parent / f"{base_stem}_v{version}{ext}"
+                if _name_key(dest_path.name) not in taken:
+                    break
+                
+                # Safety limit
+                if version > 1000:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    dest_path = dest_path.parent / f"{base_stem}_{timestamp}{ext}"
+                    break
+        
+        taken.add(_name_key(dest_path.name))
+        return dest_path
+    
     def create_plan(
         self,
         items: List[Tuple[FileRecord, Optional[Classification]]],
@@ -265,9 +378,12 @@ class Planner:
             List of PlanItems
         """
         self._reset_stats()
+        self.reset()
         
-        plan = []
         llm_used_map = llm_used_map or {}
+        fields = []
+        action_counts: Dict[str, int] = {}
+        category_counts: Dict[str, int] = {}
         
         for record, classification in items:
             llm_used = llm_used_map.get(record.path, False)
@@ -277,25 +393,31 @@ class Planner:
             else:
                 action = self.default_action
             
-            plan_item = create_plan_item(
+            item_fields = plan_item_fields(
                 record,
                 classification,
                 self.base_path,
                 action=action,
                 llm_used=llm_used,
+                resolve=self.resolve,
             )
+            fields.append(item_fields)
             
-            plan.append(plan_item)
-            
-            # Update statistics
-            self.stats["total_planned"] += 1
-            self.stats["by_action"][plan_item.action] += 1
-            
+            # Count while building; no second pass over the plan
+            action = item_fields["action"]
+            action_counts[action] = action_counts.get(action, 0) + 1
             if classification:
                 cat = classification.categoria
-                self.stats["by_category"][cat] = (
-                    self.stats["by_category"].get(cat, 0) + 1
-                )
+                category_counts[cat] = category_counts.get(cat, 0) + 1
+        
+        # Validate the whole plan in one pydantic-core call
+        plan = PlanItem.validate_many(fields)
+        
+        # Publish statistics once the plan is known to be valid
+        self.stats["total_planned"] = len(plan)
+        for action, count in action_counts.items():
+            self.stats["by_action"][action] += count
+        self.stats["by_category"] = category_counts
         
         return plan
     
@@ -311,29 +433,24 @@ class Planner:
             plan: List of PlanItems
             output_path: Path for JSON output
         """
-        data = {
+        header = {
             "generated_at": datetime.now().isoformat(),
             "base_path": str(self.base_path),
             "default_action": self.default_action,
             "stats": self.stats,
-            "items": [
-                {
-                    "action": item.action,
-                    "src": str(item.src),
-                    "dst": str(item.dst) if item.dst else None,
-                    "reason": item.reason,
-                    "confidence": item.confidence,
-                    "rule_id": item.rule_id,
-                    "llm_used": item.llm_used,
-                }
-                for item in plan
-            ],
         }
         
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Stream one item per line so memory stays flat for huge plans;
+        # PlanItems are encoded directly by pydantic-core
+        with open(output_path, "wb", buffering=1 << 20) as f:
+            f.write(to_json(header, indent=2)[:-2])  # drop closing "\n}"
+            f.write(b',\n  "items": [')
+            for i, item in enumerate(plan):
+                f.write(b"\n    " if i == 0 else b",\n    ")
+                f.write(to_json(item))
+            f.write(b"\n  ]\n}" if plan else b"]\n}")
         
         logger.info(f"Plan saved to {output_path}")
     
@@ -349,7 +466,7 @@ class Planner:
             plan: List of PlanItems
             output_path: Path for Markdown output
         """
-        lines = [
+        header = [
             "# Execution Plan",
             "",
             f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
@@ -366,23 +483,22 @@ class Planner:
             "",
         ]
         
-        for i, item in enumerate(plan, 1):
-            lines.append(f"### {i}. {item.action}")
-            lines.append("")
-            lines.append(f"- **Source**: `{item.src}`")
-            if item.dst:
-                lines.append(f"- **Destination**: `{item.dst}`")
-            lines.append(f"- **Confidence**: {item.confidence}%")
-            if item.llm_used:
-                lines.append("- **LLM Used**: Yes")
-            if item.reason:
-                lines.append(f"- **Reason**: {item.reason}")
-            lines.append("")
-        
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(lines))
+        # Write each item's block as it is formatted instead of joining
+        # the whole document in memory first
+        with open(output_path, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.write("\n".join(header))
+            for i, item in enumerate(plan, 1):
+                f.write(f"\n### {i}. {item.action}\n\n- **Source**: `{item.src}`")
+                if item.dst:
+                    f.write(f"\n- **Destination**: `{item.dst}`")
+                f.write(f"\n- **Confidence**: {item.confidence}%")
+                if item.llm_used:
+                    f.write("\n- **LLM Used**: Yes")
+                if item.reason:
+                    f.write(f"\n- **Reason**: {item.reason}")
+                f.write("\n")
         
         logger.info(f"Plan preview saved to {output_path}")
     
@@ -396,20 +512,20 @@ class Planner:
         Returns:
             List of PlanItems
         """
-        with open(input_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = from_json(Path(input_path).read_bytes())
         
-        plan = []
-        for item_data in data["items"]:
-            plan_item = PlanItem(
-                action=item_data["action"],
-                src=Path(item_data["src"]),
-                dst=Path(item_data["dst"]) if item_data["dst"] else None,
-                reason=item_data.get("reason", ""),
-                confidence=item_data.get("confidence", 0),
-                rule_id=item_data.get("rule_id"),
-                llm_used=item_data.get("llm_used", False),
-            )
-            plan.append(plan_item)
-        
-        return plan
+        # Pick the known keys (older or hand-edited plans may carry extra
+        # ones), then validate the whole list in one call
+        items = [
+            {
+                "action": item_data["action"],
+                "src": item_data["src"],
+                "dst": item_data.get("dst") or None,
+                "reason": item_data.get("reason", ""),
+                "confidence": item_data.get("confidence", 0),
+                "rule_id": item_data.get("rule_id"),
+                "llm_used": item_data.get("llm_used", False),
+            }
+            for item_data in data["items"]
+        ]
+        return PlanItem.validate_many(items)
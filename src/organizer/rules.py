@@ -26,7 +26,8 @@ import logging
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple, Union
 import fnmatch
 
 import yaml
@@ -45,6 +46,19 @@ logger = logging.getLogger(__name__)
 DEFAULT_CONFIDENCE_THRESHOLD = 85
 
 
+# =============================================================================
+# Lazy Imports
+# =============================================================================
+
+def _get_ahocorasick():
+    """Lazy import of pyahocorasick (optional, for multi-keyword scans)."""
+    try:
+        import ahocorasick
+        return ahocorasick
+    except ImportError:
+        return None
+
+
 # =============================================================================
 # Rule Data Class
 # =============================================================================
@@ -64,6 +78,8 @@ class Rule:
         keywords: Optional list of keywords to match in content
         min_size_mb: Optional minimum file size in MB
         max_size_mb: Optional maximum file size in MB
+        extensions: Lowercase extensions matched by pattern (derived)
+        keywords_lower: Lowercased keywords (derived)
     """
     rule_id: str
     pattern: str
@@ -74,44 +90,99 @@ class Rule:
     keywords: List[str] = field(default_factory=list)
     min_size_mb: Optional[float] = None
     max_size_mb: Optional[float] = None
+    extensions: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    keywords_lower: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _match: Callable[..., bool] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Expand the pattern and lowercase keywords once instead of on every match
+        self.extensions = parse_extension_pattern(self.pattern)
+        self.keywords_lower = tuple(keyword.lower() for keyword in self.keywords)
+        self._match = self._compile()
+    
+    def _compile(self) -> Callable[..., bool]:
+        """
+        Build a matcher specialized to this rule's shape.
+        
+        Missing size limits become open bounds and keyword-less rules get
+        a matcher without the keyword branch, so classify calls a single
+        closure per candidate rule instead of re-testing optional fields.
+        The extension is not checked: RuleEngine only offers a rule to
+        records whose extension it covers.
+        
+        Returns:
+            match(record, haystack=None, keyword_hit=None) -> bool, where
+            keyword_hit is the automaton's verdict for this rule (None to
+            scan the haystack instead)
+        """
+        min_bytes = (
+            self.min_size_mb * 1024 * 1024 if self.min_size_mb is not None else float("-inf")
+        )
+        max_bytes = (
+            self.max_size_mb * 1024 * 1024 if self.max_size_mb is not None else float("inf")
+        )
+        
+        if not self.keywords:
+            def match(record, haystack=None, keyword_hit=None):
+                return min_bytes <= record.size <= max_bytes
+            return match
+        
+        keywords_lower = self.keywords_lower
+        
+        def match(record, haystack=None, keyword_hit=None):
+            if not min_bytes <= record.size <= max_bytes:
+                return False
+            if keyword_hit is not None:
+                return keyword_hit
+            if haystack is None:
+                haystack = keyword_haystack(record.content_excerpt, record.path.name)
+            return _match_lowered(haystack, keywords_lower)
+        return match
 
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
-def match_extension_pattern(extension: str, pattern: str) -> bool:
+@lru_cache(maxsize=256)
+def parse_extension_pattern(pattern: str) -> FrozenSet[str]:
     """
-    Check if extension matches a pattern.
+    Expand an extension pattern into its set of extensions.
     
     Supports patterns like:
     - "*.jpg" (single extension)
     - "*.{jpg,jpeg,png}" (multiple extensions)
     
     Args:
-        extension: File extension (e.g., ".jpg" or "jpg")
-        pattern: Pattern to match (e.g., "*.{jpg,png}")
+        pattern: Pattern to expand (e.g., "*.{jpg,png}")
     
     Returns:
-        True if extension matches pattern
+        Lowercase extensions without the leading dot
     """
-    # Normalize extension
-    ext = extension.lower().lstrip(".")
-    
-    # Extract extensions from pattern
     # Pattern format: *.{jpg,jpeg,png} or *.jpg
     if "{" in pattern and "}" in pattern:
         # Multiple extensions: *.{jpg,jpeg,png}
         match = re.search(r"\{([^}]+)\}", pattern)
         if match:
-            extensions = [e.strip().lower() for e in match.group(1).split(",")]
-            return ext in extensions
-    else:
-        # Single extension: *.jpg
-        pattern_ext = pattern.replace("*.", "").lower()
-        return ext == pattern_ext
+            return frozenset(e.strip().lower() for e in match.group(1).split(","))
+        return frozenset()
     
-    return False
+    # Single extension: *.jpg
+    return frozenset({pattern.replace("*.", "").lower()})
+
+
+def match_extension_pattern(extension: str, pattern: str) -> bool:
+    """
+    Check if extension matches a pattern.
+    
+    Args:
+        extension: File extension (e.g., ".jpg" or "jpg")
+        pattern: Pattern to match (e.g., "*.{jpg,png}")
+    
+    Returns:
+        True if extension matches pattern
+    """
+    return extension.lower().lstrip(".") in parse_extension_pattern(pattern)
 
 
 def match_keywords(
@@ -133,46 +204,115 @@ def match_keywords(
     if not keywords:
         return True  # No keywords = match all
     
-    # Combine content and filename for searching
+    return _match_lowered(
+        keyword_haystack(content, filename),
+        [keyword.lower() for keyword in keywords],
+    )
+
+
+def keyword_haystack(content: Optional[str], filename: Optional[str] = None) -> str:
+    """
+    Build the lowercased text that keywords are searched in.
+    
+    Computed once per file and shared by every keyword rule.
+    
+    Args:
+        content: File content excerpt
+        filename: Optional filename to search
+    
+    Returns:
+        Lowercased content and filename
+    """
     search_text = ""
     if content:
         search_text += content.lower()
     if filename:
         search_text += " " + filename.lower()
-    
-    if not search_text:
+    return search_text
+
+
+def _match_lowered(haystack: str, keywords_lower: Iterable[str]) -> bool:
+    """Substring test of already-lowercased keywords against a haystack."""
+    if not haystack:
         return False
+    return any(keyword in haystack for keyword in keywords_lower)
+
+
+def build_keyword_automaton(rules: List[Rule]):
+    """
+    Build one Aho-Corasick automaton over every rule's keywords.
+    
+    A single pass over a file's haystack then yields all keyword rules
+    it satisfies, instead of one substring scan per rule and keyword.
+    
+    Args:
+        rules: Rules to index (rules without keywords are ignored)
+    
+    Returns:
+        Automaton mapping each keyword to the positions in rules of the
+        rules using it, or None if pyahocorasick is not installed or no
+        rule has keywords
+    """
+    ahocorasick = _get_ahocorasick()
+    if ahocorasick is None:
+        return None
     
-    # Check each keyword
-    for keyword in keywords:
-        if keyword.lower() in search_text:
-            return True
+    # Keyed by position: rule_id is not guaranteed unique, and object
+    # identity does not survive copying a rule
+    rules_by_keyword: Dict[str, set] = {}
+    for index, rule in enumerate(rules):
+        for keyword in rule.keywords_lower:
+            if not keyword:
+                return None  # "" matches everything; leave it to the fallback
+            rules_by_keyword.setdefault(keyword, set()).add(index)
     
-    return False
+    if not rules_by_keyword:
+        return None
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, indices in rules_by_keyword.items():
+        automaton.add_word(keyword, frozenset(indices))
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=32)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> Dict:
+    """Parse a YAML file; mtime and size in the key invalidate edited files."""
+    with open(path_str, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def _load_yaml_file(path: Path) -> Dict:
+    """Load a rules file, reusing the parsed result while it is unchanged."""
+    stat = path.stat()
+    return _load_yaml_cached(str(path), stat.st_mtime_ns, stat.st_size)
 
 
 def load_rules_from_yaml(
-    source: Union[Path, Dict, str]
+    source: Union[Path, Mapping, str]
 ) -> List[Rule]:
     """
     Load rules from YAML file or config dict.
     
+    Parsed files are cached by (path, mtime, size), so loading the same
+    unchanged rules file again skips YAML parsing.
+    
     Args:
-        source: Path to YAML file, file content string, or config dict
+        source: Path to YAML file, file content string, or config mapping
+            (plain dict or read-only view such as MappingProxyType)
     
     Returns:
         List of Rule objects
     """
     # Load config
-    if isinstance(source, dict):
+    if isinstance(source, Mapping):
         config = source
     elif isinstance(source, Path):
-        with open(source, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        config = _load_yaml_file(source)
     elif isinstance(source, str):
         if source.endswith(".yaml") or source.endswith(".yml"):
-            with open(source, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            config = _load_yaml_file(Path(source))
         else:
             config = yaml.safe_load(source)
     else:
@@ -188,7 +328,7 @@ def load_rules_from_yaml(
             confidence=rule_config.get("confidence", 90),
             description=rule_config.get("description", ""),
             subcategory=rule_config.get("subcategory", ""),
-            keywords=rule_config.get("keywords", []),
+            keywords=list(rule_config.get("keywords", [])),
             min_size_mb=rule_config.get("min_size_mb"),
             max_size_mb=rule_config.get("max_size_mb"),
         )
@@ -216,7 +356,7 @@ class RuleEngine:
 
     def __init__(
         self,
-        rules_config: Optional[Union[Dict, List[Rule]]] = None,
+        rules_config: Optional[Union[Mapping, List[Rule]]] = None,
         rules_file: Optional[Path] = None,
         confidence_threshold: int = DEFAULT_CONFIDENCE_THRESHOLD,
         min_confidence: int = None,
@@ -225,7 +365,7 @@ class RuleEngine:
         Initialize RuleEngine with rules.
         
         Args:
-            rules_config: Rules configuration dict or list of Rule objects
+            rules_config: Rules configuration mapping or list of Rule objects
             rules_file: Path to rules YAML file
             confidence_threshold: Minimum confidence threshold (deprecated, use min_confidence)
             min_confidence: Minimum confidence threshold
@@ -249,49 +389,70 @@ class RuleEngine:
         else:
             self.rules = []
         
+        # (position in self.rules, rule) per extension, in evaluation order;
+        # the position is what the keyword automaton reports
+        self._rules_by_ext: Dict[str, List[Tuple[int, Rule]]] = {}
+        for index, rule in enumerate(self.rules):
+            for ext in rule.extensions:
+                self._rules_by_ext.setdefault(ext, []).append((index, rule))
+        
+        # Multi-keyword matcher (None falls back to per-rule substring scans)
+        self._keyword_automaton = build_keyword_automaton(self.rules)
+        
         # Statistics
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        """Reset statistics counters (rules are kept)."""
         self.stats = {
             "total_classified": 0,
             "total_unmatched": 0,
             "rule_hits": {},
         }
 
-    def _matches_rule(self, record: FileRecord, rule: Rule) -> bool:
+    def _matches_rule(
+        self,
+        record: FileRecord,
+        rule: Rule,
+        haystack: Optional[str] = None,
+        keyword_hit: Optional[bool] = None,
+    ) -> bool:
         """
         Check if a FileRecord matches a rule.
         
         Args:
             record: FileRecord to check
             rule: Rule to match against
+            haystack: Precomputed keyword_haystack for the record
+            keyword_hit: Whether the automaton found the rule's keywords
+                (None to scan the haystack)
         
         Returns:
             True if record matches rule
         """
         # Check extension pattern
-        if not match_extension_pattern(record.extension, rule.pattern):
+        if record.extension.lower().lstrip(".") not in rule.extensions:
             return False
         
-        # Check size filters
-        if rule.min_size_mb is not None:
-            min_bytes = rule.min_size_mb * 1024 * 1024
-            if record.size < min_bytes:
-                return False
-        
-        if rule.max_size_mb is not None:
-            max_bytes = rule.max_size_mb * 1024 * 1024
-            if record.size > max_bytes:
-                return False
-        
-        # Check keywords (only if specified)
-        if rule.keywords:
-            if not match_keywords(
-                record.content_excerpt,
-                rule.keywords,
-                filename=record.path.name
-            ):
-                return False
+        # Size filters and keywords (compiled per rule)
+        return rule._match(record, haystack, keyword_hit)
+
+    def _keyword_inputs(
+        self, record: FileRecord
+    ) -> Tuple[str, Optional[FrozenSet[int]]]:
+        """
+        Lowercased keyword haystack and automaton hits for a record.
         
-        return True
+        Returns:
+            (haystack, positions in self.rules of keyword rules found),
+            hits being None when no automaton is available
+        """
+        haystack = keyword_haystack(record.content_excerpt, record.path.name)
+        if self._keyword_automaton is None:
+            return haystack, None
+        return haystack, frozenset().union(
+            *(indices for _, indices in self._keyword_automaton.iter(haystack))
+        )
 
     def _create_classification(
         self,
@@ -330,7 +491,8 @@ class RuleEngine:
         """
         Classify a FileRecord using rules.
         
-        Evaluates rules in order. First matching rule wins.
+        Evaluates rules in order. First matching rule wins. Only rules
+        whose pattern covers the record's extension are considered.
         
         Args:
             record: FileRecord to classify
@@ -338,8 +500,18 @@ class RuleEngine:
         Returns:
             Classification if matched, None otherwise
         """
-        for rule in self.rules:
-            if self._matches_rule(record, rule):
+        ext = record.extension.lower().lstrip(".")
+        candidates = self._rules_by_ext.get(ext, ())
+        
+        # Lowercase the excerpt once (and scan it once) for all keyword rules
+        haystack, keyword_hits = None, None
+        if any(rule.keywords for _, rule in candidates):
+            haystack, keyword_hits = self._keyword_inputs(record)
+        
+        # Candidates already cover the extension; run each rule's matcher
+        for index, rule in candidates:
+            keyword_hit = None if keyword_hits is None else index in keyword_hits
+            if rule._match(record, haystack, keyword_hit):
                 # Check confidence threshold
                 if rule.confidence < self.confidence_threshold:
                     continue  # Skip low-confidence rules
@@ -356,6 +528,60 @@ class RuleEngine:
         self.stats["total_unmatched"] += 1
         return None
 
+    def classify_many(
+        self,
+        records: List[FileRecord],
+    ) -> List[Optional[Classification]]:
+        """
+        Classify many FileRecords in one bucketed pass.
+        
+        Records are grouped by extension so each bucket looks up its
+        candidate rules once, and statistics are merged once per bucket
+        instead of per file. Matching is the same as classify().
+        
+        Args:
+            records: FileRecords to classify
+        
+        Returns:
+            Classifications (or None) in the same order as records
+        """
+        buckets: Dict[str, List[int]] = {}
+        for i, record in enumerate(records):
+            buckets.setdefault(record.extension.lower().lstrip("."), []).append(i)
+        
+        results: List[Optional[Classification]] = [None] * len(records)
+        rule_hits: Dict[str, int] = {}
+        for ext, indices in buckets.items():
+            candidates = [
+                (index, rule) for index, rule in self._rules_by_ext.get(ext, ())
+                if rule.confidence >= self.confidence_threshold
+            ]
+            if not candidates:
+                continue
+            needs_keywords = any(rule.keywords for _, rule in candidates)
+            
+            for i in indices:
+                record = records[i]
+                haystack, keyword_hits = None, None
+                if needs_keywords:
+                    haystack, keyword_hits = self._keyword_inputs(record)
+                
+                for index, rule in candidates:
+                    keyword_hit = None if keyword_hits is None else index in keyword_hits
+                    if rule._match(record, haystack, keyword_hit):
+                        results[i] = self._create_classification(record, rule)
+                        rule_hits[rule.rule_id] = rule_hits.get(rule.rule_id, 0) + 1
+                        break
+        
+        # Merge statistics once for the whole batch
+        classified = sum(rule_hits.values())
+        self.stats["total_classified"] += classified
+        self.stats["total_unmatched"] += len(records) - classified
+        for rule_id, hits in rule_hits.items():
+            self.stats["rule_hits"][rule_id] = self.stats["rule_hits"].get(rule_id, 0) + hits
+        
+        return results
+
     def classify_batch(
         self,
         records: List[FileRecord]
@@ -369,4 +595,4 @@ class RuleEngine:
         Returns:
             List of (FileRecord, Classification or None) tuples
         """
-        return [(record, self.classify(record)) for record in records]
+        return list(zip(records, self.classify_many(records)))
@@ -17,9 +17,15 @@ Safety Features:
 - Tracks statistics for audit/debugging
 """
 import hashlib
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import chain
 from pathlib import Path
-from typing import Generator, Optional, Set
+from typing import AbstractSet, Callable, Dict, FrozenSet, Generator, List, Optional, Tuple
 
 from src.organizer.models import FileRecord
 
@@ -28,7 +34,8 @@ from src.organizer.models import FileRecord
 # Exclusion Constants
 # =============================================================================
 
-EXCLUDED_DIRECTORIES: Set[str] = {
+# Frozensets: matched by exact name with a single hash lookup
+EXCLUDED_DIRECTORIES: FrozenSet[str] = frozenset({
     # Version control
     ".git",
     ".svn",
@@ -73,9 +80,9 @@ EXCLUDED_DIRECTORIES: Set[str] = {
     ".aws",
     ".azure",
     ".terraform",
-}
+})
 
-EXCLUDED_EXTENSIONS: Set[str] = {
+EXCLUDED_EXTENSIONS: FrozenSet[str] = frozenset({
     # Executables (dangerous)
     ".exe",
     ".dll",
@@ -105,35 +112,103 @@ EXCLUDED_EXTENSIONS: Set[str] = {
     ".db-journal",
     ".db-wal",
     ".db-shm",
-}
+})
 
 # Minimum file size in bytes (default: 1KB)
 DEFAULT_MIN_FILE_SIZE: int = 1024
 
+# Concurrent SHA256 computations in Scanner.scan (hashlib releases the GIL);
+# capped so rotational disks are not thrashed by too many parallel reads
+DEFAULT_HASH_WORKERS: int = min(8, os.cpu_count() or 1)
+
+# Directory listings run on this many threads when a tree is wide enough
+# (scandir blocks in the kernel, so listing overlaps like hashing does)
+DEFAULT_WALK_WORKERS: int = min(8, os.cpu_count() or 1)
+
+# Parallel listing only pays off for roots with more subdirectories than this
+PARALLEL_WALK_MIN_SUBDIRS: int = 4
+
+# Read block for hashing: large enough that per-call overhead is noise
+# next to the SHA256 compute on each block
+HASH_BLOCK_SIZE: int = 1 << 20
+
+# Readahead hints for queued files: smaller files are read in one block
+# anyway, and the advised length is capped so a queue of huge files does
+# not pull gigabytes into the page cache ahead of the hasher
+PREFETCH_MIN_BYTES: int = HASH_BLOCK_SIZE
+PREFETCH_MAX_BYTES: int = 8 << 20
+
 
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
-def calculate_sha256(file_path: Path, chunk_size: int = 8192) -> Optional[str]:
+def _prefetch(file_path: Path, size: int) -> None:
+    """
+    Ask the kernel to start reading a file that will be hashed soon.
+
+    Best effort: POSIX_FADV_WILLNEED queues readahead and returns at once,
+    so the pages load while earlier files are still being hashed. Only
+    the first PREFETCH_MAX_BYTES are advised; the kernel's own sequential
+    readahead takes over once hashing starts. A no-op where posix_fadvise
+    is unavailable (Windows, macOS).
+
+    Args:
+        file_path: File queued for hashing
+        size: File size in bytes
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, min(size, PREFETCH_MAX_BYTES), os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# One read buffer per thread, reused for every file that thread hashes
+_thread_buffers = threading.local()
+
+
+def _read_buffer() -> memoryview:
+    """Return this thread's HASH_BLOCK_SIZE read buffer, allocating it once."""
+    view = getattr(_thread_buffers, "view", None)
+    if view is None:
+        view = _thread_buffers.view = memoryview(bytearray(HASH_BLOCK_SIZE))
+    return view
+
+
+def calculate_sha256(file_path: Path) -> Optional[str]:
     """
     Calculate SHA256 hash of a file.
 
-    Uses chunked reading for memory efficiency with large files.
+    The hash comes from hashlib.new(usedforsecurity=False), which uses the
+    platform OpenSSL (SHA-NI accelerated on CPUs that support it) and skips
+    FIPS wrappers: the digest is for deduplication, not security. Data is
+    read with readinto() in HASH_BLOCK_SIZE blocks from an unbuffered
+    handle into a per-thread buffer reused across files; both readinto()
+    and update() release the GIL. Files are deliberately not mmap'ed: a
+    mapped file that shrinks mid-hash (still being written) raises SIGBUS
+    and kills the process, while the read loop just sees a short read.
 
     Args:
         file_path: Path to the file
-        chunk_size: Size of chunks to read (default 8KB)
 
     Returns:
         SHA256 hex digest string, or None if file cannot be read
     """
     try:
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(chunk_size), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest()
+        with open(file_path, "rb", buffering=0) as f:
+            digest = hashlib.new("sha256", usedforsecurity=False)
+            view = _read_buffer()
+            while n := f.readinto(view):
+                digest.update(view[:n])
+            return digest.hexdigest()
     except (OSError, IOError, PermissionError):
         return None
 
@@ -142,24 +217,23 @@ def should_exclude_directory(dir_path: Path) -> bool:
     """
     Check if a directory should be excluded from scanning.
 
+    Only the directory's own name is checked: the Scanner prunes excluded
+    directories as it walks, so their descendants are never visited.
+
     Args:
         dir_path: Path to the directory
 
     Returns:
         True if directory should be excluded
     """
-    # Check if any part of the path is in excluded set
-    for part in dir_path.parts:
-        if part in EXCLUDED_DIRECTORIES:
-            return True
-    return False
+    return dir_path.name in EXCLUDED_DIRECTORIES
 
 
 def should_exclude_file(
     file_path: Path,
     file_size: int,
     min_size: int = DEFAULT_MIN_FILE_SIZE,
-    excluded_extensions: Optional[Set[str]] = None
+    excluded_extensions: Optional[AbstractSet[str]] = None
 ) -> bool:
     """
     Check if a file should be excluded from scanning.
@@ -188,6 +262,30 @@ def should_exclude_file(
     return False
 
 
+@lru_cache(maxsize=4096)
+def _local_datetime(timestamp: float) -> datetime:
+    """
+    datetime.fromtimestamp, memoized.
+
+    Files very often share timestamps (mtime == ctime on the same file,
+    whole folders extracted or copied at once), and datetimes are
+    immutable, so repeated values reuse one object instead of converting
+    again.
+    """
+    return datetime.fromtimestamp(timestamp)
+
+
+def _extension(name: str) -> str:
+    """
+    Lowercased suffix of a file name, as Path(name).suffix.lower().
+
+    Works on the bare name with one rfind and one slice, so no Path is
+    built. Leading-dot names (".bashrc") and trailing dots have no suffix.
+    """
+    dot = name.rfind(".")
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+
+
 # =============================================================================
 # Scanner Class
 # =============================================================================
@@ -203,14 +301,18 @@ class Scanner:
         min_file_size: Minimum file size to include (bytes)
         excluded_dirs: Set of directory names to skip
         excluded_extensions: Set of file extensions to skip
+        hash_workers: Number of files hashed concurrently
+        walk_workers: Number of directories listed concurrently
         stats: Dictionary tracking scan statistics
     """
 
     def __init__(
         self,
         min_file_size: int = DEFAULT_MIN_FILE_SIZE,
-        excluded_dirs: Optional[Set[str]] = None,
-        excluded_extensions: Optional[Set[str]] = None,
+        excluded_dirs: Optional[AbstractSet[str]] = None,
+        excluded_extensions: Optional[AbstractSet[str]] = None,
+        hash_workers: int = DEFAULT_HASH_WORKERS,
+        walk_workers: int = DEFAULT_WALK_WORKERS,
     ):
         """
         Initialize Scanner with exclusion rules.
@@ -219,12 +321,23 @@ class Scanner:
             min_file_size: Minimum file size to include (default 1KB)
             excluded_dirs: Custom set of directories to exclude
             excluded_extensions: Custom set of extensions to exclude
+                (matched case-insensitively)
+            hash_workers: Number of files hashed concurrently (1 = serial)
+            walk_workers: Number of directories listed concurrently (1 = serial)
         """
         self.min_file_size = min_file_size
-        self.excluded_dirs = excluded_dirs if excluded_dirs is not None else EXCLUDED_DIRECTORIES
-        self.excluded_extensions = (
-            excluded_extensions if excluded_extensions is not None else EXCLUDED_EXTENSIONS
+        # Frozen once here so the per-entry checks are plain hash lookups
+        # on a set the caller can no longer mutate mid-scan
+        self.excluded_dirs: FrozenSet[str] = (
+            frozenset(excluded_dirs) if excluded_dirs is not None else EXCLUDED_DIRECTORIES
         )
+        self.excluded_extensions: FrozenSet[str] = (
+            frozenset(ext.lower() for ext in excluded_extensions)
+            if excluded_extensions is not None
+            else EXCLUDED_EXTENSIONS
+        )
+        self.hash_workers = max(1, hash_workers)
+        self.walk_workers = max(1, walk_workers)
 
         # Statistics tracking
         self.stats = {
@@ -247,35 +360,47 @@ class Scanner:
         """Check if directory name is in exclusion set."""
         return dir_name in self.excluded_dirs
 
-    def _create_file_record(self, file_path: Path) -> FileRecord:
+    def _create_file_record(
+        self,
+        file_path: Path,
+        stat: Optional[os.stat_result] = None,
+        compute_hash: bool = True,
+    ) -> FileRecord:
         """
         Create a FileRecord from a file path.
 
         Args:
             file_path: Path to the file
+            stat: Stat result already taken during the walk (optional)
+            compute_hash: Read the file for its SHA256 (else sha256=None)
 
         Returns:
             FileRecord with file metadata
         """
-        stat = file_path.stat()
+        if stat is None:
+            stat = file_path.stat()
 
         return FileRecord(
             path=file_path,
             size=stat.st_size,
-            mtime=datetime.fromtimestamp(stat.st_mtime),
-            ctime=datetime.fromtimestamp(stat.st_ctime),
-            sha256=calculate_sha256(file_path),
-            extension=file_path.suffix.lower(),
+            mtime=_local_datetime(stat.st_mtime),
+            ctime=_local_datetime(stat.st_ctime),
+            sha256=calculate_sha256(file_path) if compute_hash else None,
+            extension=_extension(file_path.name),
             mime=None,  # Will be set by Extractor if needed
             content_excerpt=None,  # Will be set by Extractor
         )
 
-    def scan(self, root_path: Path) -> Generator[FileRecord, None, None]:
+    def scan(
+        self, root_path: Path, compute_hash: bool = True
+    ) -> Generator[FileRecord, None, None]:
         """
         Scan directory tree and yield FileRecord for each valid file.
 
         Args:
             root_path: Root directory to start scanning
+            compute_hash: Hash file contents. Pass False when only path and
+                metadata are needed: no file is opened and sha256 is None
 
         Yields:
             FileRecord for each file passing exclusion filters
@@ -283,54 +408,277 @@ class Scanner:
         Raises:
             FileNotFoundError: If root_path does not exist
         """
+        root_path = self._start_scan(root_path)
+
+        candidates = self._iter_candidates(root_path)
+        first = next(candidates, None)
+        second = next(candidates, None)
+        if first is None:
+            return
+        if second is None or self.hash_workers == 1 or not compute_hash:
+            # Nothing to overlap: build records on the calling thread, no pool
+            rest = [] if second is None else [second]
+            for current_path, stat in chain([first], rest, candidates):
+                yield from self._collect(
+                    partial(self._create_file_record, current_path, stat, compute_hash)
+                )
+            return
+
+        # Hash files on a thread pool while the walk continues; a bounded
+        # window of in-flight files keeps results streaming in walk order
+        window: deque = deque()
+        max_in_flight = self.hash_workers * 4
+        executor = ThreadPoolExecutor(max_workers=self.hash_workers)
+        try:
+            for current_path, stat in chain([first, second], candidates):
+                # Large files beyond the running workers wait in the window:
+                # warm their first pages now so the hash does not stall on
+                # the disk (small files are not worth the extra open)
+                if (
+                    len(window) >= self.hash_workers
+                    and stat.st_size >= PREFETCH_MIN_BYTES
+                ):
+                    _prefetch(current_path, stat.st_size)
+                window.append(
+                    executor.submit(
+                        self._create_file_record, current_path, stat, compute_hash
+                    )
+                )
+                if len(window) >= max_in_flight:
+                    yield from self._collect(window.popleft().result)
+
+            while window:
+                yield from self._collect(window.popleft().result)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def scan_stats(self, root_path: Path) -> Dict[str, int]:
+        """
+        Compute the statistics scan() would report, without FileRecords.
+
+        Runs the same walk and filters but stops at the stat already taken
+        for each file: nothing is hashed and no records are built. Use it
+        when only counts and sizes are needed.
+
+        Args:
+            root_path: Root directory to start scanning
+
+        Returns:
+            Copy of self.stats after the walk
+
+        Raises:
+            FileNotFoundError: If root_path does not exist
+        """
+        root_path = self._start_scan(root_path)
+        for _, stat in self._iter_candidates(root_path):
+            self.stats["files_scanned"] += 1
+            self.stats["total_size_bytes"] += stat.st_size
+        return dict(self.stats)
+
+    def _start_scan(self, root_path: Path) -> Path:
+        """Validate the scan root and reset statistics."""
         root_path = Path(root_path)
 
         if not root_path.exists():
             raise FileNotFoundError(f"Directory not found: {root_path}")
 
         self._reset_stats()
+        return root_path
 
-        for current_path in root_path.rglob("*"):
-            # Skip directories (we only yield files)
-            if current_path.is_dir():
-                # Track excluded directories for stats
-                if self._should_exclude_dir(current_path.name):
-                    self.stats["directories_excluded"] += 1
-                continue
+    def _iter_candidates(
+        self, root_path: Path
+    ) -> Generator[Tuple[Path, os.stat_result], None, None]:
+        """
+        Yield (path, stat) for files that pass the exclusion filters.
+
+        Applies the same filters as should_exclude_file, but straight from
+        the DirEntry: the extension is checked on the name before any
+        syscall, so excluded types are never stat'ed, and the Path object
+        is only built for files that are kept. The filter settings are
+        fixed for the scan, so they are bound to locals once up front.
+        """
+        excluded_extensions = self.excluded_extensions
+        min_size = self.min_file_size
+        stats = self.stats
 
-            # Check if file is in an excluded directory
-            if should_exclude_directory(current_path.parent):
+        for entry in self._walk(root_path):
+            if _extension(entry.name) in excluded_extensions:
+                stats["files_excluded"] += 1
                 continue
 
-            # Get file stats
+            # One stat per file (cached on the DirEntry where the OS allows).
+            # os.stat already uses statx on modern Linux; a ctypes wrapper
+            # would add per-call overhead for no gain on local filesystems
             try:
-                file_size = current_path.stat().st_size
+                stat = entry.stat()
             except (OSError, PermissionError):
-                self.stats["files_excluded"] += 1
+                stats["files_excluded"] += 1
                 continue
 
-            # Apply exclusion filters
-            if should_exclude_file(
-                current_path,
-                file_size,
-                min_size=self.min_file_size,
-                excluded_extensions=self.excluded_extensions,
-            ):
-                self.stats["files_excluded"] += 1
+            if stat.st_size < min_size:
+                stats["files_excluded"] += 1
                 continue
 
-            # Create and yield FileRecord
+            yield Path(entry.path), stat
+
+    def _collect(
+        self, build: Callable[[], FileRecord]
+    ) -> Generator[FileRecord, None, None]:
+        """
+        Yield the FileRecord returned by build, updating statistics.
+
+        build is a Future's result method or a direct call; either way the
+        stats are only touched here, on the consuming thread, so no lock
+        is needed.
+        """
+        try:
+            record = build()
+        except (OSError, PermissionError):
+            self.stats["files_excluded"] += 1
+            return
+
+        self.stats["files_scanned"] += 1
+        self.stats["total_size_bytes"] += record.size
+        yield record
+
+    def _list_dir(
+        self, dir_path: str
+    ) -> Optional[Tuple[List[os.DirEntry], List[str], int]]:
+        """
+        Read one directory with os.scandir.
+
+        Directory checks come from the entry's d_type, excluded directories
+        are pruned by name and symlinked directories are skipped entirely:
+        they are not followed and not reported as files.
+        Touches no shared state, so it can run on worker threads.
+
+        Args:
+            dir_path: Directory to list
+
+        Returns:
+            (file entries, subdirectories to visit, excluded directory
+            count), or None if the directory cannot be read
+        """
+        files: List[os.DirEntry] = []
+        subdirs: List[str] = []
+        excluded = 0
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if self._should_exclude_dir(entry.name):
+                            excluded += 1
+                        else:
+                            subdirs.append(entry.path)
+                    elif entry.is_symlink() and entry.is_dir():
+                        # Symlinked directory: neither a file nor descended into
+                        if self._should_exclude_dir(entry.name):
+                            excluded += 1
+                    else:
+                        files.append(entry)
+        except OSError:
+            return None
+        return files, subdirs, excluded
+
+    def _walk(self, root_path: Path) -> Generator[os.DirEntry, None, None]:
+        """
+        Yield a DirEntry for every non-directory below root_path.
+
+        The tree is always consumed depth-first in listing order, so the
+        output order does not depend on walk_workers or the CPU count.
+        When the root has more than PARALLEL_WALK_MIN_SUBDIRS subdirectories
+        and walk_workers > 1, the directories the walk will reach next are
+        listed (and their files stat'ed) ahead of time on a thread pool.
+        Unreadable directories are skipped.
+
+        Args:
+            root_path: Root directory to walk
+
+        Yields:
+            DirEntry for each file (including symlinks to files)
+        """
+        listing = self._list_dir(os.fspath(root_path))
+        if listing is None:
+            return
+        files, subdirs, excluded = listing
+        self.stats["directories_excluded"] += excluded
+        yield from files
+
+        # Reverse so directories are visited in listing order
+        pending = subdirs[::-1]
+        if self.walk_workers > 1 and len(subdirs) > PARALLEL_WALK_MIN_SUBDIRS:
+            executor = ThreadPoolExecutor(max_workers=self.walk_workers)
             try:
-                record = self._create_file_record(current_path)
-                self.stats["files_scanned"] += 1
-                self.stats["total_size_bytes"] += file_size
-                yield record
-            except (OSError, PermissionError):
-                self.stats["files_excluded"] += 1
+                yield from self._walk_pending(pending, executor)
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            yield from self._walk_pending(pending)
+
+    def _walk_pending(
+        self,
+        pending: List[str],
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> Generator[os.DirEntry, None, None]:
+        """
+        Depth-first walk of the pending directory stack.
+
+        With an executor, the directories nearest the top of the stack
+        (the next ones the walk pops) are listed ahead of time. At most
+        4 x walk_workers listings are queued or held, so wide directories
+        keep back-pressure; a directory with no listing ready is read
+        inline.
+
+        Args:
+            pending: Stack of directories to visit (last is visited first)
+            executor: Pool for read-ahead listings, or None to walk serially
+
+        Yields:
+            DirEntry for each file, in depth-first listing order
+        """
+        ahead: Dict[str, Future] = {}
+        max_ahead = self.walk_workers * 4
+        while pending:
+            if executor is not None:
+                for dir_path in reversed(pending[-max_ahead:]):
+                    if len(ahead) >= max_ahead:
+                        break
+                    if dir_path not in ahead:
+                        ahead[dir_path] = executor.submit(self._list_dir_stat, dir_path)
+
+            dir_path = pending.pop()
+            future = ahead.pop(dir_path, None)
+            listing = future.result() if future is not None else self._list_dir(dir_path)
+            if listing is None:
                 continue
+            files, subdirs, excluded = listing
+            self.stats["directories_excluded"] += excluded
+            yield from files
+            pending.extend(reversed(subdirs))
+
+    def _list_dir_stat(
+        self, dir_path: str
+    ) -> Optional[Tuple[List[os.DirEntry], List[str], int]]:
+        """
+        _list_dir, then stat each file whose extension is not excluded.
+
+        DirEntry caches its stat result, so when this runs on a walk worker
+        the metadata of a whole directory is fetched off the consuming
+        thread, and the later entry.stat() in _iter_candidates is free.
+        Failures are left for the consumer to hit and count.
+        """
+        listing = self._list_dir(dir_path)
+        if listing is not None:
+            for entry in listing[0]:
+                if _extension(entry.name) not in self.excluded_extensions:
+                    try:
+                        entry.stat()
+                    except OSError:
+                        pass
+        return listing
 
     def scan_with_progress(
-        self, root_path: Path, callback=None
+        self, root_path: Path, callback=None, compute_hash: bool = True
     ) -> Generator[FileRecord, None, None]:
         """
         Scan directory tree with progress callback.
@@ -338,12 +686,13 @@ class Scanner:
         Args:
             root_path: Root directory to start scanning
             callback: Optional callback(current_count, file_path) for progress
+            compute_hash: Hash file contents (see scan)
 
         Yields:
             FileRecord for each file passing exclusion filters
         """
         count = 0
-        for record in self.scan(root_path):
+        for record in self.scan(root_path, compute_hash=compute_hash):
             count += 1
             if callback:
                 callback(count, record.path)
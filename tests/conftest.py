@@ -3,6 +3,7 @@ Pytest configuration and shared fixtures for Local File Organizer tests.
 """
 import pytest
 from pathlib import Path
+from typing import Callable
 import tempfile
 import shutil
 import json
@@ -41,6 +42,25 @@ def temp_dir_with_structure(temp_dir):
 # Sample File Fixtures
 # =============================================================================
 
+def _make_sized_file(path: Path, header: bytes, size: int) -> Path:
+    """
+    Write header and extend the file to size without writing the rest.
+    
+    truncate() leaves the tail as a hole, so only the header bytes touch
+    the disk while stat() and size rules still see the full size.
+    """
+    with open(path, "wb") as f:
+        f.write(header)
+        f.truncate(size)
+    return path
+
+
+@pytest.fixture(scope="session")
+def make_sized_file() -> Callable[[Path, bytes, int], Path]:
+    """Helper for synthetic-size files: make_sized_file(path, header, size)."""
+    return _make_sized_file
+
+
 @pytest.fixture
 def sample_pdf(temp_dir):
     """Create minimal valid PDF for testing."""
@@ -198,6 +218,32 @@ def sample_unknown_record():
     )
 
 
+@pytest.fixture
+def make_plan_item():
+    """
+    Factory for PlanItems built without validation.
+    
+    For tests where PlanItem validation is not under test; use PlanItem(...)
+    directly when checking validators.
+    """
+    from src.organizer.models import PlanItem
+    
+    def factory(**overrides):
+        fields = dict(
+            action="MOVE",
+            src=Path("src.pdf"),
+            dst=Path("dst.pdf"),
+            reason="test",
+            confidence=100,
+            rule_id=None,
+            llm_used=False,
+        )
+        fields.update(overrides)
+        return PlanItem.model_construct(**fields)
+    
+    return factory
+
+
 # =============================================================================
 # Mock Response Fixtures
 # =============================================================================
@@ -233,7 +233,7 @@ class TestExecuteCommand:
         # Create the source file that the plan references
         (temp_dir / "doc1.txt").write_text("Test content")
         
-        result = runner.invoke(cli, ["execute", str(plan_file)])
+        result = runner.invoke(cli, ["execute", str(plan_file), "--log-dir", str(temp_dir / "logs")])
         
         assert result.exit_code == 0
         assert "dry-run" in result.output.lower() or "dry run" in result.output.lower()
@@ -245,7 +245,7 @@ class TestExecuteCommand:
         (temp_dir / "doc1.txt").write_text("Test content")
         
         # Without --apply, should be dry-run
-        result = runner.invoke(cli, ["execute", str(plan_file)])
+        result = runner.invoke(cli, ["execute", str(plan_file), "--log-dir", str(temp_dir / "logs")])
         
         assert result.exit_code == 0
         assert (temp_dir / "doc1.txt").exists()  # Still exists
@@ -254,7 +254,9 @@ class TestExecuteCommand:
         """Test execute with --apply actually moves files."""
         (temp_dir / "doc1.txt").write_text("Test content")
         
-        result = runner.invoke(cli, ["execute", str(plan_file), "--apply"])
+        result = runner.invoke(cli, [
+            "execute", str(plan_file), "--apply", "--log-dir", str(temp_dir / "logs"),
+        ])
         
         assert result.exit_code == 0
         # File should be moved
@@ -280,7 +282,9 @@ class TestExecuteCommand:
         """Test execute shows execution summary."""
         (temp_dir / "doc1.txt").write_text("Test content")
         
-        result = runner.invoke(cli, ["execute", str(plan_file), "--apply"])
+        result = runner.invoke(cli, [
+            "execute", str(plan_file), "--apply", "--log-dir", str(temp_dir / "logs"),
+        ])
         
         assert result.exit_code == 0
         # Should show summary
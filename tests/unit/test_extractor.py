@@ -489,6 +489,8 @@ class TestExtractorExtract:
         assert enriched.path == record.path
         assert enriched.size == record.size
         assert enriched.sha256 == "original_hash"
+        assert enriched is not record
+        assert record.content_excerpt is None
 
     def test_extract_large_file_truncates(self, large_text_file):
         """Should truncate content for large files."""
@@ -596,6 +598,75 @@ class TestExtractorStats:
         
         assert extractor.stats["extraction_errors"] >= 0
 
+    def test_duplicate_hash_skips_extraction(self, temp_dir):
+        """Files with an already-seen sha256 should reuse the cached excerpt."""
+        records = []
+        for i in range(3):
+            txt = temp_dir / f"copia{i}.txt"
+            txt.write_text("Mesmo conteúdo em todas as cópias.")
+            records.append(FileRecord(
+                path=txt,
+                size=txt.stat().st_size,
+                mtime=datetime.now(),
+                ctime=datetime.now(),
+                sha256="samehash",
+                extension=".txt",
+            ))
+        
+        extractor = Extractor()
+        with patch.object(
+            extractor, "_extract_content", wraps=extractor._extract_content
+        ) as spy:
+            results = list(extractor.extract_batch(records))
+        
+        assert spy.call_count == 1
+        assert extractor.stats["cache_hits"] == 2
+        assert all("Mesmo conteúdo" in r.content_excerpt for r in results)
+        assert [r.path for r in results] == [r.path for r in records]
+
+    def test_same_hash_different_extension_not_shared(self, temp_dir):
+        """Identical bytes under another extension should be extracted again."""
+        records = []
+        for ext in (".txt", ".csv"):
+            path = temp_dir / f"dados{ext}"
+            path.write_text("nome,valor\nitem,10\n")
+            records.append(FileRecord(
+                path=path,
+                size=path.stat().st_size,
+                mtime=datetime.now(),
+                ctime=datetime.now(),
+                sha256="samehash",
+                extension=ext,
+            ))
+        
+        extractor = Extractor()
+        with patch.object(
+            extractor, "_extract_content", wraps=extractor._extract_content
+        ) as spy:
+            txt, csv = [extractor.extract(r) for r in records]
+        
+        assert spy.call_count == 2
+        assert extractor.stats["cache_hits"] == 0
+        assert txt.mime == detect_mime_type(records[0].path)
+        assert csv.mime == detect_mime_type(records[1].path)
+
+    def test_cache_is_bounded(self, temp_dir):
+        """The extraction cache should evict old entries past cache_size."""
+        extractor = Extractor(cache_size=2)
+        for i in range(4):
+            path = temp_dir / f"nota{i}.txt"
+            path.write_text(f"Conteúdo {i}")
+            extractor.extract(FileRecord(
+                path=path,
+                size=path.stat().st_size,
+                mtime=datetime.now(),
+                ctime=datetime.now(),
+                sha256=f"hash{i}",
+                extension=".txt",
+            ))
+        
+        assert list(extractor._cache) == [("hash2", ".txt"), ("hash3", ".txt")]
+
 
 # =============================================================================
 # Test Audio Extraction
@@ -636,6 +707,25 @@ class TestExtractAudioMetadata:
         assert "Duration: 3m" in content
         assert "Bitrate: 320 kbps" in content
 
+    def test_extract_audio_dispatches_by_extension(self, temp_dir):
+        """Known extensions should skip mutagen's format autodetection."""
+        mutagen = pytest.importorskip("mutagen")
+        from mutagen.mp3 import MP3
+        import src.organizer.extractor as ext_module
+        
+        audio_file = temp_dir / "song.mp3"
+        audio_file.write_bytes(b"ID3 fake audio content")
+        
+        original_mutagen = ext_module.mutagen
+        ext_module.mutagen = mutagen
+        try:
+            with patch.object(mutagen, "File", return_value=None) as mock_file:
+                ext_module.extract_audio_metadata(audio_file)
+        finally:
+            ext_module.mutagen = original_mutagen
+        
+        assert mock_file.call_args_list[0].kwargs["options"] == [MP3]
+
     def test_extract_audio_nonexistent_file(self, temp_dir):
         """Should return None for non-existent file."""
         from src.organizer.extractor import extract_audio_metadata
@@ -826,4 +916,40 @@ class TestExtractorMediaFiles:
         result = extractor.extract(record)
         
         assert result.content_excerpt is not None
-        assert "1280x720" in result.content_excerpt
\ No newline at end of file
+        assert "1280x720" in result.content_excerpt
+
+    @patch("subprocess.run")
+    def test_extract_many_probes_videos_concurrently(self, mock_run, temp_dir):
+        """extract_many should probe every video and keep input order."""
+        import src.organizer.extractor as ext_module
+        
+        ext_module.ffprobe_path = "ffprobe"
+        
+        mock_result = MagicMock()
+        mock_result.returncode = 0
+        mock_result.stdout = '''{
+            "format": {"duration": "120.0"},
+            "streams": [{"codec_type": "video", "width": 1280, "height": 720}]
+        }'''
+        mock_run.return_value = mock_result
+        
+        records = []
+        for i in range(8):
+            video_file = temp_dir / f"video{i}.mp4"
+            video_file.write_bytes(b"fake video content %d" % i)
+            records.append(FileRecord(
+                path=video_file,
+                size=video_file.stat().st_size,
+                mtime=datetime.now(),
+                ctime=datetime.now(),
+                sha256=f"hash{i}",
+                extension=".mp4",
+            ))
+        
+        extractor = Extractor()
+        results = extractor.extract_many(records, workers=4)
+        
+        assert [r.path for r in results] == [r.path for r in records]
+        assert all("1280x720" in r.content_excerpt for r in results)
+        assert mock_run.call_count == 8
+        assert extractor.stats["files_processed"] == 8
@@ -14,10 +14,12 @@ The LLM Classifier is responsible for:
 from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock, AsyncMock
+import asyncio
 import json
 
 import pytest
 
+import src.organizer.llm as llm_module
 from src.organizer.models import FileRecord, Classification, VALID_CATEGORIES
 from src.organizer.llm import (
     LLMClassifier,
@@ -26,7 +28,10 @@ from src.organizer.llm import (
     DEFAULT_BASE_URL,
     DEFAULT_TIMEOUT,
     DEFAULT_MAX_RETRIES,
+    CLASSIFICATION_SCHEMA,
+    CLASSIFICATION_SYSTEM_PROMPT,
     build_classification_prompt,
+    build_file_prompt,
     parse_llm_response,
     validate_classification_json,
 )
@@ -36,11 +41,35 @@ from src.organizer.llm import (
 # Test Fixtures
 # =============================================================================
 
+class FakeOllamaClient:
+    """Plain stand-in for OllamaClient returning canned replies (no mock overhead)."""
+
+    def __init__(self, replies):
+        self.replies = iter(replies)
+        self.calls = 0
+
+    def health_check(self):
+        return True
+
+    def generate(self, prompt, **kwargs):
+        self.calls += 1
+        return next(self.replies)
+
+
 @pytest.fixture
-def sample_file_record(temp_dir):
+def fake_ollama(monkeypatch):
+    """Install a FakeOllamaClient built from the given replies."""
+    def install(replies):
+        fake = FakeOllamaClient(replies)
+        monkeypatch.setattr(llm_module, "OllamaClient", lambda **kwargs: fake)
+        return fake
+    return install
+
+
+@pytest.fixture
+def sample_file_record(temp_dir, make_sized_file):
     """Create a sample FileRecord for testing."""
-    txt_file = temp_dir / "documento_importante.pdf"
-    txt_file.write_bytes(b"%PDF" + b"x" * 5000)
+    txt_file = make_sized_file(temp_dir / "documento_importante.pdf", b"%PDF", 5004)
     
     return FileRecord(
         path=txt_file,
@@ -152,6 +181,26 @@ class TestBuildClassificationPrompt:
         assert "confianca" in prompt
         assert "racional" in prompt
 
+    def test_prompt_bounds_long_excerpt(self, sample_file_record):
+        """Prompt size should not grow with the excerpt length."""
+        record = sample_file_record.model_copy(
+            update={"content_excerpt": "INICIO " + "x" * 100_000 + " FIM"}
+        )
+        
+        prompt = build_classification_prompt(record)
+        
+        assert len(prompt) < 4096
+        assert "INICIO" in prompt
+        assert "FIM" in prompt
+
+    def test_file_prompt_excludes_static_header(self, sample_file_record):
+        """Per-file prompt should only carry the variable part."""
+        prompt = build_file_prompt(sample_file_record)
+        
+        assert "documento_importante.pdf" in prompt
+        assert "Valid Categories" not in prompt
+        assert "Valid Categories" in CLASSIFICATION_SYSTEM_PROMPT
+
 
 # =============================================================================
 # Test Response Parsing
@@ -289,6 +338,61 @@ class TestOllamaClient:
         assert result is not None
         mock_post.assert_called_once()
 
+    @patch("src.organizer.llm.requests.post")
+    def test_client_generate_sends_format(self, mock_post, mock_ollama_response):
+        """Should pass output_format as Ollama's format field."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = mock_ollama_response
+        mock_response.status_code = 200
+        mock_post.return_value = mock_response
+        
+        client = OllamaClient()
+        client.generate("Test prompt", output_format=CLASSIFICATION_SCHEMA)
+        
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["format"] == CLASSIFICATION_SCHEMA
+
+    @patch("src.organizer.llm.requests.post")
+    def test_client_generate_sends_system(self, mock_post, mock_ollama_response):
+        """Should pass the system message in the payload."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = mock_ollama_response
+        mock_response.status_code = 200
+        mock_post.return_value = mock_response
+        
+        client = OllamaClient()
+        client.generate("Test prompt", system=CLASSIFICATION_SYSTEM_PROMPT)
+        
+        payload = mock_post.call_args.kwargs["json"]
+        assert payload["system"] == CLASSIFICATION_SYSTEM_PROMPT
+
+    @patch("src.organizer.llm.requests.post")
+    def test_client_stream_stops_at_first_json(self, mock_post, valid_llm_response):
+        """Streaming should stop reading once a JSON object is complete."""
+        consumed = []
+        
+        def lines():
+            for chunk in (
+                {"response": json.dumps(valid_llm_response), "done": False},
+                {"response": " Explanation the model likes to add.", "done": False},
+                {"response": "", "done": True},
+            ):
+                consumed.append(chunk)
+                yield json.dumps(chunk).encode()
+        
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.iter_lines.return_value = lines()
+        mock_post.return_value = mock_response
+        
+        client = OllamaClient(stream=True)
+        result = client.generate("Test prompt")
+        
+        assert parse_llm_response(result) == valid_llm_response
+        assert len(consumed) == 1
+        assert mock_post.call_args.kwargs["json"]["stream"] is True
+        mock_response.close.assert_called_once()
+
     @patch("src.organizer.llm.requests.get")
     def test_client_health_check(self, mock_get):
         """Should check Ollama health endpoint."""
@@ -359,24 +463,55 @@ class TestLLMClassifierClassify:
         assert isinstance(classification, Classification)
         assert classification.categoria == "01_Trabalho"
 
-    @patch("src.organizer.llm.OllamaClient")
     def test_classify_retries_on_invalid_json(
-        self, mock_client_class, sample_file_record, valid_llm_response
+        self, fake_ollama, sample_file_record, valid_llm_response
     ):
         """Should retry on invalid JSON response."""
-        mock_client = MagicMock()
         # First call returns invalid, second returns valid
-        mock_client.generate.side_effect = [
+        fake = fake_ollama([
             "Invalid response",
             json.dumps(valid_llm_response),
-        ]
+        ])
+        
+        classifier = LLMClassifier(max_retries=3)
+        classification = classifier.classify(sample_file_record)
+        
+        assert classification is not None
+        assert fake.calls == 2
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_classify_constrains_output_with_schema(
+        self, mock_client_class, sample_file_record, valid_llm_response
+    ):
+        """Schema-constrained output should parse on the first attempt."""
+        mock_client = MagicMock()
+        mock_client.generate.return_value = json.dumps(valid_llm_response)
         mock_client_class.return_value = mock_client
         
         classifier = LLMClassifier(max_retries=3)
         classification = classifier.classify(sample_file_record)
         
         assert classification is not None
-        assert mock_client.generate.call_count == 2
+        assert mock_client.generate.call_count == 1
+        assert mock_client.generate.call_args.kwargs["output_format"] == CLASSIFICATION_SCHEMA
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_classify_reuses_static_system_prompt(
+        self, mock_client_class, sample_file_record, valid_llm_response
+    ):
+        """Every call should send the same system prompt object."""
+        mock_client = MagicMock()
+        mock_client.generate.return_value = json.dumps(valid_llm_response)
+        mock_client_class.return_value = mock_client
+        
+        classifier = LLMClassifier()
+        classifier.classify(sample_file_record)
+        classifier.classify(sample_file_record)
+        
+        calls = mock_client.generate.call_args_list
+        assert len(calls) == 2
+        assert all(c.kwargs["system"] is CLASSIFICATION_SYSTEM_PROMPT for c in calls)
+        assert "Valid Categories" not in calls[0].args[0]
 
     @patch("src.organizer.llm.OllamaClient")
     def test_classify_returns_inbox_on_low_confidence(
@@ -403,50 +538,196 @@ class TestLLMClassifierClassify:
         # Should route to inbox or return None
         assert classification is None or classification.categoria == "90_Inbox_Organizar"
 
-    @patch("src.organizer.llm.OllamaClient")
     def test_classify_returns_none_after_max_retries(
-        self, mock_client_class, sample_file_record
+        self, fake_ollama, sample_file_record
     ):
         """Should return None after exhausting retries."""
-        mock_client = MagicMock()
-        mock_client.generate.return_value = "Always invalid"
-        mock_client_class.return_value = mock_client
+        fake = fake_ollama(["Always invalid"] * 2)
         
         classifier = LLMClassifier(max_retries=2)
         classification = classifier.classify(sample_file_record)
         
         assert classification is None
-        assert mock_client.generate.call_count == 2
+        assert fake.calls == 2
+
+
+class TestLLMClassifierEscalation:
+    """Test the two-tier fast model / main model strategy."""
+
+    @staticmethod
+    def _response(valid_llm_response, confianca):
+        data = dict(valid_llm_response, confianca=confianca)
+        return json.dumps(data)
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_fast_model_answers_confident_files(
+        self, mock_client_class, sample_file_record, valid_llm_response
+    ):
+        """Confident fast answers should not reach the main model."""
+        main_client, fast_client = MagicMock(), MagicMock()
+        fast_client.generate.return_value = self._response(valid_llm_response, 95)
+        mock_client_class.side_effect = [main_client, fast_client]
+        
+        classifier = LLMClassifier(fast_model="qwen2.5:3b-q4_K_M", escalate_below=80)
+        classification = classifier.classify(sample_file_record)
+        
+        assert classification is not None
+        assert classification.confianca == 95
+        assert fast_client.generate.call_count == 1
+        main_client.generate.assert_not_called()
+        assert classifier.stats["escalations"] == 0
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_low_confidence_escalates_to_main_model(
+        self, mock_client_class, sample_file_record, valid_llm_response
+    ):
+        """Low-confidence fast answers should be re-run on the main model."""
+        main_client, fast_client = MagicMock(), MagicMock()
+        fast_client.generate.return_value = self._response(valid_llm_response, 50)
+        main_client.generate.return_value = self._response(valid_llm_response, 92)
+        mock_client_class.side_effect = [main_client, fast_client]
+        
+        classifier = LLMClassifier(fast_model="qwen2.5:3b-q4_K_M", escalate_below=80)
+        classification = classifier.classify(sample_file_record)
+        
+        assert classification is not None
+        assert classification.confianca == 92
+        assert main_client.generate.call_count == 1
+        assert classifier.stats["escalations"] == 1
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_no_fast_model_by_default(self, mock_client_class):
+        """Escalation should be opt-in."""
+        classifier = LLMClassifier()
+        
+        assert classifier.fast_client is None
 
 
 class TestLLMClassifierStats:
     """Test LLMClassifier statistics."""
 
-    @patch("src.organizer.llm.OllamaClient")
     def test_tracks_successful_classifications(
-        self, mock_client_class, sample_file_record, valid_llm_response
+        self, fake_ollama, sample_file_record, valid_llm_response
     ):
         """Should track successful classifications."""
-        mock_client = MagicMock()
-        mock_client.generate.return_value = json.dumps(valid_llm_response)
-        mock_client_class.return_value = mock_client
+        fake_ollama([json.dumps(valid_llm_response)])
         
         classifier = LLMClassifier()
         classifier.classify(sample_file_record)
         
         assert classifier.stats["successful"] == 1
 
-    @patch("src.organizer.llm.OllamaClient")
-    def test_tracks_retries(self, mock_client_class, sample_file_record, valid_llm_response):
+    def test_tracks_retries(self, fake_ollama, sample_file_record, valid_llm_response):
         """Should track retry count."""
-        mock_client = MagicMock()
-        mock_client.generate.side_effect = [
+        fake_ollama([
             "Invalid",
             json.dumps(valid_llm_response),
-        ]
-        mock_client_class.return_value = mock_client
+        ])
         
         classifier = LLMClassifier()
         classifier.classify(sample_file_record)
         
         assert classifier.stats["retries"] >= 1
+
+
+class TestLLMClassifierMany:
+    """Test LLMClassifier.classify_many() method."""
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_classify_many_returns_all_in_order(
+        self, mock_client_class, temp_dir, valid_llm_response
+    ):
+        """Should classify every record and keep stats consistent."""
+        records = [
+            FileRecord(
+                path=temp_dir / f"arquivo_{i}.pdf",
+                size=2048,
+                mtime=datetime(2024, 3, i + 1),
+                ctime=datetime(2024, 3, i + 1),
+                extension=".pdf",
+                content_excerpt=f"Documento {i}",
+            )
+            for i in range(8)
+        ]
+        mock_client = MagicMock()
+        mock_client.generate.return_value = json.dumps(valid_llm_response)
+        mock_client_class.return_value = mock_client
+        
+        classifier = LLMClassifier()
+        results = classifier.classify_many(records, workers=4)
+        
+        assert len(results) == 8
+        assert all(isinstance(r, Classification) for r in results)
+        assert classifier.stats["successful"] == 8
+        assert mock_client.generate.call_count == 8
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_classify_many_empty(self, mock_client_class):
+        """Empty input should return an empty list."""
+        mock_client = MagicMock()
+        mock_client_class.return_value = mock_client
+        
+        classifier = LLMClassifier()
+        
+        assert classifier.classify_many([]) == []
+        mock_client.generate.assert_not_called()
+
+
+class TestLLMClassifierBatch:
+    """Test LLMClassifier.classify_batch() method."""
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_classify_batch_deduplicates_identical_excerpts(
+        self, mock_client_class, temp_dir, valid_llm_response
+    ):
+        """Files sharing an excerpt should trigger a single LLM call."""
+        excerpts = ["Fatura de energia", "Contrato de aluguel", "Relatório de vendas"]
+        records = [
+            FileRecord(
+                path=temp_dir / f"arquivo_{i}.pdf",
+                size=2048,
+                mtime=datetime(2024, 3, i + 1),
+                ctime=datetime(2024, 3, i + 1),
+                extension=".pdf",
+                content_excerpt=excerpts[i % 3],
+            )
+            for i in range(10)
+        ]
+        
+        classifier = LLMClassifier()
+        classifier._classify_single = AsyncMock(
+            side_effect=lambda record: Classification(**valid_llm_response)
+        )
+        
+        results = asyncio.run(classifier.classify_batch(records))
+        
+        assert classifier._classify_single.call_count == 3
+        assert len(results) == 10
+        assert all(r.categoria == "01_Trabalho" for r in results)
+        # Broadcast results carry their own record's date
+        assert results[3].nome_sugerido.startswith("2024-03-04")
+
+    @patch("src.organizer.llm.OllamaClient")
+    def test_classify_batch_never_groups_missing_excerpts(
+        self, mock_client_class, temp_dir, valid_llm_response
+    ):
+        """Files without an excerpt should each get their own LLM call."""
+        records = [
+            FileRecord(
+                path=temp_dir / f"scan_{i}.pdf",
+                size=2048,
+                mtime=datetime(2024, 3, 1),
+                ctime=datetime(2024, 3, 1),
+                extension=".pdf",
+            )
+            for i in range(4)
+        ]
+        
+        classifier = LLMClassifier()
+        classifier._classify_single = AsyncMock(
+            side_effect=lambda record: Classification(**valid_llm_response)
+        )
+        
+        asyncio.run(classifier.classify_batch(records))
+        
+        assert classifier._classify_single.call_count == 4
@@ -8,19 +8,27 @@ import pytest
 from pathlib import Path
 from datetime import datetime
 
+from pydantic import ValidationError
+
+from src.organizer.models import (
+    Category, FileRecord, Classification, PlanItem, ExecutionResult, VALID_CATEGORIES,
+    from_json, to_json
+)
+
+# Fixed timestamp for deterministic records
+NOW = datetime(2025, 1, 13, 12, 0, 0)
+
 
 class TestFileRecord:
     """Tests for FileRecord model."""
 
     def test_create_valid_file_record(self):
         """FileRecord deve aceitar todos os campos válidos."""
-        from src.organizer.models import FileRecord
-        
         record = FileRecord(
             path=Path("C:/Users/test/file.pdf"),
             size=1024,
-            mtime=datetime.now(),
-            ctime=datetime.now(),
+            mtime=NOW,
+            ctime=NOW,
             sha256="abc123def456789012345678901234567890123456789012345678901234",
             extension=".pdf",
             mime="application/pdf",
@@ -34,14 +42,11 @@ class TestFileRecord:
 
     def test_file_record_requires_path(self):
         """FileRecord deve falhar sem path."""
-        from src.organizer.models import FileRecord
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             FileRecord(
                 size=1024,
-                mtime=datetime.now(),
-                ctime=datetime.now(),
+                mtime=NOW,
+                ctime=NOW,
                 sha256="abc123",
                 extension=".pdf",
                 mime="application/pdf"
@@ -49,13 +54,11 @@ class TestFileRecord:
 
     def test_file_record_content_excerpt_optional(self):
         """content_excerpt deve ser opcional (None por padrão)."""
-        from src.organizer.models import FileRecord
-        
         record = FileRecord(
             path=Path("test.txt"),
             size=100,
-            mtime=datetime.now(),
-            ctime=datetime.now(),
+            mtime=NOW,
+            ctime=NOW,
             sha256="hash123",
             extension=".txt",
             mime="text/plain"
@@ -65,35 +68,50 @@ class TestFileRecord:
 
     def test_file_record_size_must_be_positive(self):
         """size deve ser >= 0."""
-        from src.organizer.models import FileRecord
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             FileRecord(
                 path=Path("test.txt"),
                 size=-100,  # Invalid
-                mtime=datetime.now(),
-                ctime=datetime.now(),
+                mtime=NOW,
+                ctime=NOW,
                 sha256="hash123",
                 extension=".txt",
                 mime="text/plain"
             )
 
-    def test_file_record_extension_normalized(self):
-        """extension deve ser normalizada (lowercase)."""
-        from src.organizer.models import FileRecord
+    def test_file_record_is_frozen(self):
+        """FileRecord deve ser imutável; alterações via model_copy."""
+        record = FileRecord(
+            path=Path("test.txt"), size=100, mtime=NOW, ctime=NOW, extension=".txt"
+        )
+        
+        with pytest.raises(ValidationError):
+            record.mime = "text/plain"
         
+        assert record.model_copy(update={"mime": "text/plain"}).mime == "text/plain"
+
+    def test_file_record_rejects_unknown_fields(self):
+        """Campos desconhecidos devem ser rejeitados."""
+        with pytest.raises(ValidationError):
+            FileRecord(
+                path=Path("test.txt"), size=100, mtime=NOW, ctime=NOW,
+                extension=".txt", unknown="x"
+            )
+
+    def test_file_record_extension_normalized(self):
+        """extension chega normalizada (lowercase) do Scanner e é mantida."""
+        path = Path("test.PDF")
         record = FileRecord(
-            path=Path("test.PDF"),
+            path=path,
             size=100,
-            mtime=datetime.now(),
-            ctime=datetime.now(),
+            mtime=NOW,
+            ctime=NOW,
             sha256="hash123",
-            extension=".PDF",
+            extension=path.suffix.lower(),
             mime="application/pdf"
         )
         
-        # Should be normalized to lowercase
+        # Normalization happens at ingest (see test_scanner)
         assert record.extension == ".pdf"
 
 
@@ -102,8 +120,6 @@ class TestClassification:
 
     def test_create_valid_classification(self):
         """Classification deve aceitar resposta LLM válida."""
-        from src.organizer.models import Classification
-        
         classification = Classification(
             categoria="03_Estudos",
             subcategoria="Python",
@@ -119,8 +135,6 @@ class TestClassification:
 
     def test_classification_confidence_range_valid(self):
         """confianca deve aceitar valores entre 0 e 100."""
-        from src.organizer.models import Classification
-        
         # Test lower bound
         low = Classification(
             categoria="90_Inbox_Organizar",
@@ -145,22 +159,9 @@ class TestClassification:
         )
         assert high.confianca == 100
 
-    def test_classification_confidence_out_of_range(self):
+    @pytest.mark.parametrize("confianca", [150, -10])
+    def test_classification_confidence_out_of_range(self, confianca):
         """confianca fora de 0-100 deve falhar."""
-        from src.organizer.models import Classification
-        from pydantic import ValidationError
-        
-        with pytest.raises(ValidationError):
-            Classification(
-                categoria="03_Estudos",
-                subcategoria="",
-                assunto="",
-                ano=2025,
-                nome_sugerido="",
-                confianca=150,  # Invalid - over 100
-                racional=""
-            )
-        
         with pytest.raises(ValidationError):
             Classification(
                 categoria="03_Estudos",
@@ -168,27 +169,45 @@ class TestClassification:
                 assunto="",
                 ano=2025,
                 nome_sugerido="",
-                confianca=-10,  # Invalid - negative
+                confianca=confianca,
                 racional=""
             )
 
-    def test_classification_valid_categories(self):
+    @pytest.mark.parametrize("categoria", [
+        "01_Trabalho",
+        "02_Financas",
+        "03_Estudos",
+        "04_Livros",
+        "05_Pessoal",
+        "90_Inbox_Organizar",
+    ])
+    def test_classification_valid_categories(self, categoria):
         """categoria deve ser uma das categorias permitidas."""
-        from src.organizer.models import Classification, VALID_CATEGORIES
+        assert categoria in VALID_CATEGORIES
+
+    def test_valid_categories_is_frozenset(self):
+        """VALID_CATEGORIES deve ser imutável e com busca O(1)."""
+        assert isinstance(VALID_CATEGORIES, frozenset)
+        assert len(VALID_CATEGORIES) == 6
+
+    def test_classification_categoria_is_category(self):
+        """categoria vira Category, mas segue igual à string (e no JSON)."""
+        classification = Classification(
+            categoria="03_Estudos",
+            subcategoria="Cursos",
+            assunto="Python",
+            ano=2024,
+            nome_sugerido="curso.pdf",
+            confianca=90,
+            racional="ok",
+        )
         
-        # Check expected categories exist
-        assert "01_Trabalho" in VALID_CATEGORIES
-        assert "02_Financas" in VALID_CATEGORIES
-        assert "03_Estudos" in VALID_CATEGORIES
-        assert "04_Livros" in VALID_CATEGORIES
-        assert "05_Pessoal" in VALID_CATEGORIES
-        assert "90_Inbox_Organizar" in VALID_CATEGORIES
+        assert classification.categoria is Category.ESTUDOS
+        assert classification.categoria == "03_Estudos"
+        assert '"categoria":"03_Estudos"' in classification.model_dump_json()
 
     def test_classification_invalid_category(self):
         """categoria inválida deve falhar."""
-        from src.organizer.models import Classification
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             Classification(
                 categoria="99_Invalid_Category",  # Not in valid list
@@ -202,9 +221,6 @@ class TestClassification:
 
     def test_classification_year_reasonable(self):
         """ano deve ser um ano razoável (1900-2100)."""
-        from src.organizer.models import Classification
-        from pydantic import ValidationError
-        
         # Valid year
         valid = Classification(
             categoria="03_Estudos",
@@ -229,14 +245,50 @@ class TestClassification:
                 racional=""
             )
 
+    def test_classification_from_llm_json(self):
+        """from_llm_json deve extrair o JSON do texto do LLM e validar."""
+        text = (
+            "Aqui está a classificação:\n```json\n"
+            '{"categoria": "02_Financas", "subcategoria": "Faturas", '
+            '"assunto": "Conta {luz}", "ano": 2024, '
+            '"nome_sugerido": "2024-01-10__02_Financas__Conta_luz.pdf", '
+            '"confianca": 91, "racional": "Fatura de energia"}\n```\n'
+            "Espero ter ajudado!"
+        )
+        
+        classification = Classification.from_llm_json(text)
+        
+        assert classification.categoria == "02_Financas"
+        assert classification.assunto == "Conta {luz}"
+        assert classification.confianca == 91
+
+    def test_classification_ignores_extra_llm_keys(self):
+        """Chaves extras na resposta do LLM devem ser ignoradas."""
+        classification = Classification.from_llm_json(
+            '{"categoria": "03_Estudos", "subcategoria": "Cursos", "assunto": "Python", '
+            '"ano": 2024, "nome_sugerido": "curso.pdf", "confianca": 90, '
+            '"racional": "ok", "idioma": "pt"}'
+        )
+        
+        assert not hasattr(classification, "idioma")
+
+    def test_classification_from_llm_json_invalid(self):
+        """from_llm_json deve falhar com ValueError para saída inválida."""
+        with pytest.raises(ValueError):
+            Classification.from_llm_json("Sem JSON aqui")
+        
+        with pytest.raises(ValueError):
+            Classification.from_llm_json(
+                '{"categoria": "99_Invalid", "subcategoria": "", "assunto": "", '
+                '"ano": 2024, "nome_sugerido": "", "confianca": 50, "racional": ""}'
+            )
+
 
 class TestPlanItem:
     """Tests for PlanItem model."""
 
     def test_create_move_plan_item(self):
         """PlanItem MOVE deve ter src e dst."""
-        from src.organizer.models import PlanItem
-        
         item = PlanItem(
             action="MOVE",
             src=Path("C:/Downloads/file.pdf"),
@@ -253,8 +305,6 @@ class TestPlanItem:
 
     def test_skip_plan_item_allows_none_dst(self):
         """PlanItem SKIP pode ter dst=None."""
-        from src.organizer.models import PlanItem
-        
         item = PlanItem(
             action="SKIP",
             src=Path("C:/Downloads/file.exe"),
@@ -268,29 +318,27 @@ class TestPlanItem:
         assert item.action == "SKIP"
         assert item.dst is None
 
-    def test_valid_actions_only(self):
+    @pytest.mark.parametrize("action,dst", [
+        ("MOVE", Path("dest.txt")),
+        ("RENAME", Path("dest.txt")),
+        ("COPY", Path("dest.txt")),
+        ("SKIP", None),
+    ])
+    def test_valid_actions_only(self, action, dst):
         """action deve ser MOVE, RENAME, COPY ou SKIP."""
-        from src.organizer.models import PlanItem
-        from pydantic import ValidationError
-        
-        # Valid actions
-        for action in ["MOVE", "RENAME", "COPY", "SKIP"]:
-            item = PlanItem(
-                action=action,
-                src=Path("file.txt"),
-                dst=Path("dest.txt") if action != "SKIP" else None,
-                reason="test",
-                confidence=100,
-                rule_id=None,
-                llm_used=False
-            )
-            assert item.action == action
+        item = PlanItem(
+            action=action,
+            src=Path("file.txt"),
+            dst=dst,
+            reason="test",
+            confidence=100,
+            rule_id=None,
+            llm_used=False
+        )
+        assert item.action == action
 
     def test_delete_action_forbidden(self):
         """DELETE nunca deve ser permitido (guardrail)."""
-        from src.organizer.models import PlanItem
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             PlanItem(
                 action="DELETE",  # FORBIDDEN - never delete!
@@ -304,9 +352,6 @@ class TestPlanItem:
 
     def test_plan_item_confidence_range(self):
         """confidence deve estar entre 0 e 100."""
-        from src.organizer.models import PlanItem
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             PlanItem(
                 action="MOVE",
@@ -320,9 +365,6 @@ class TestPlanItem:
 
     def test_plan_item_requires_src(self):
         """PlanItem deve ter src."""
-        from src.organizer.models import PlanItem
-        from pydantic import ValidationError
-        
         with pytest.raises(ValidationError):
             PlanItem(
                 action="MOVE",
@@ -338,19 +380,9 @@ class TestPlanItem:
 class TestExecutionResult:
     """Tests for ExecutionResult model."""
 
-    def test_create_success_result(self):
+    def test_create_success_result(self, make_plan_item):
         """ExecutionResult success deve ter status e plan_item."""
-        from src.organizer.models import PlanItem, ExecutionResult
-        
-        item = PlanItem(
-            action="MOVE",
-            src=Path("src.pdf"),
-            dst=Path("dst.pdf"),
-            reason="test",
-            confidence=100,
-            rule_id=None,
-            llm_used=False
-        )
+        item = make_plan_item()
         
         result = ExecutionResult(
             status="success",
@@ -362,19 +394,9 @@ class TestExecutionResult:
         assert result.error is None
         assert result.timestamp is not None
 
-    def test_create_failed_result(self):
+    def test_create_failed_result(self, make_plan_item):
         """ExecutionResult failed deve ter error message."""
-        from src.organizer.models import PlanItem, ExecutionResult
-        
-        item = PlanItem(
-            action="MOVE",
-            src=Path("src.pdf"),
-            dst=Path("dst.pdf"),
-            reason="test",
-            confidence=100,
-            rule_id=None,
-            llm_used=False
-        )
+        item = make_plan_item()
         
         result = ExecutionResult(
             status="failed",
@@ -385,49 +407,30 @@ class TestExecutionResult:
         assert result.status == "failed"
         assert "Permission denied" in result.error
 
-    def test_valid_status_values(self):
+    @pytest.mark.parametrize("status", ["success", "failed", "skipped", "dry-run"])
+    def test_valid_status_values(self, status, make_plan_item):
         """status deve ser success, failed, skipped ou dry-run."""
-        from src.organizer.models import PlanItem, ExecutionResult
-        from pydantic import ValidationError
+        item = make_plan_item(action="SKIP", dst=None)
         
-        item = PlanItem(
-            action="SKIP",
-            src=Path("src.pdf"),
-            dst=None,
-            reason="test",
-            confidence=100,
-            rule_id=None,
-            llm_used=False
+        result = ExecutionResult(
+            status=status,
+            plan_item=item
         )
+        assert result.status == status
+
+    def test_invalid_status_value(self, make_plan_item):
+        """status fora da lista deve falhar."""
+        item = make_plan_item(action="SKIP", dst=None)
         
-        # Valid statuses
-        for status in ["success", "failed", "skipped", "dry-run"]:
-            result = ExecutionResult(
-                status=status,
-                plan_item=item
-            )
-            assert result.status == status
-        
-        # Invalid status
         with pytest.raises(ValidationError):
             ExecutionResult(
                 status="invalid_status",
                 plan_item=item
             )
 
-    def test_execution_result_has_timestamp(self):
+    def test_execution_result_has_timestamp(self, make_plan_item):
         """ExecutionResult deve ter timestamp automático."""
-        from src.organizer.models import PlanItem, ExecutionResult
-        
-        item = PlanItem(
-            action="SKIP",
-            src=Path("src.pdf"),
-            dst=None,
-            reason="test",
-            confidence=100,
-            rule_id=None,
-            llm_used=False
-        )
+        item = make_plan_item(action="SKIP", dst=None)
         
         result = ExecutionResult(
             status="success",
@@ -438,64 +441,85 @@ class TestExecutionResult:
         assert isinstance(result.timestamp, datetime)
 
 
+# =============================================================================
+# Serialization Fixtures
+# =============================================================================
+
+@pytest.fixture(scope="module")
+def built_file_record():
+    """FileRecord compartilhado pelos testes de serialização."""
+    return FileRecord(
+        path=Path("C:/test/file.pdf"),
+        size=1024,
+        mtime=datetime(2025, 1, 13, 10, 0, 0),
+        ctime=datetime(2025, 1, 10, 8, 0, 0),
+        sha256="hash123",
+        extension=".pdf",
+        mime="application/pdf"
+    )
+
+
+@pytest.fixture(scope="module")
+def built_classification():
+    """Classification compartilhada pelos testes de serialização."""
+    return Classification(
+        categoria="03_Estudos",
+        subcategoria="Python",
+        assunto="FastAPI Tutorial",
+        ano=2025,
+        nome_sugerido="2025-01-13__Estudos__FastAPI.pdf",
+        confianca=92,
+        racional="Technical document"
+    )
+
+
+@pytest.fixture(scope="module")
+def built_plan_item():
+    """PlanItem compartilhado pelos testes de serialização."""
+    return PlanItem(
+        action="MOVE",
+        src=Path("C:/src/file.pdf"),
+        dst=Path("C:/dst/file.pdf"),
+        reason="Test move",
+        confidence=100,
+        rule_id="TEST_RULE",
+    )
+
+
 class TestModelSerialization:
     """Tests for model serialization (JSON export)."""
 
-    def test_file_record_to_dict(self):
-        """FileRecord deve serializar para dict."""
-        from src.organizer.models import FileRecord
+    @pytest.mark.parametrize("fixture_name,expected", [
+        ("built_file_record", {"path": Path("C:/test/file.pdf"), "size": 1024}),
+        ("built_classification", {"categoria": "03_Estudos", "confianca": 92}),
+        ("built_plan_item", {"action": "MOVE", "rule_id": "TEST_RULE", "llm_used": False}),
+    ])
+    def test_model_to_dict(self, request, fixture_name, expected):
+        """Modelos devem serializar para dict (JSON export)."""
+        data = request.getfixturevalue(fixture_name).model_dump()
         
+        for key, value in expected.items():
+            assert data[key] == value
+
+    def test_file_record_to_json_round_trip(self):
+        """to_json deve gerar JSON que reconstrói o mesmo FileRecord."""
         record = FileRecord(
-            path=Path("C:/test/file.pdf"),
+            path=Path("C:/test/relatório.pdf"),
             size=1024,
             mtime=datetime(2025, 1, 13, 10, 0, 0),
             ctime=datetime(2025, 1, 10, 8, 0, 0),
             sha256="hash123",
             extension=".pdf",
-            mime="application/pdf"
         )
         
-        data = record.model_dump()
+        encoded = to_json(record)
         
-        assert "path" in data
-        assert "size" in data
-        assert data["size"] == 1024
+        assert isinstance(encoded, bytes)
+        assert FileRecord.model_validate_json(encoded) == record
 
-    def test_classification_to_dict(self):
-        """Classification deve serializar para dict (JSON export)."""
-        from src.organizer.models import Classification
-        
-        classification = Classification(
-            categoria="03_Estudos",
-            subcategoria="Python",
-            assunto="FastAPI Tutorial",
-            ano=2025,
-            nome_sugerido="2025-01-13__Estudos__FastAPI.pdf",
-            confianca=92,
-            racional="Technical document"
-        )
-        
-        data = classification.model_dump()
-        
-        assert data["categoria"] == "03_Estudos"
-        assert data["confianca"] == 92
-
-    def test_plan_item_to_dict(self):
-        """PlanItem deve serializar para dict."""
-        from src.organizer.models import PlanItem
-        
-        item = PlanItem(
-            action="MOVE",
-            src=Path("C:/src/file.pdf"),
-            dst=Path("C:/dst/file.pdf"),
-            reason="Test move",
-            confidence=100,
-            rule_id="TEST_RULE",
-            llm_used=False
-        )
-        
-        data = item.model_dump()
+    def test_from_json_decodes_to_json_output(self, built_plan_item):
+        """from_json deve decodificar a saída de to_json em dicts simples."""
+        data = from_json(to_json({"items": [built_plan_item]}))
         
-        assert data["action"] == "MOVE"
-        assert data["rule_id"] == "TEST_RULE"
-        assert data["llm_used"] is False
+        assert data["items"][0]["src"] == str(Path("C:/src/file.pdf"))
+        assert PlanItem.validate_many(data["items"]) == [built_plan_item]
@@ -11,9 +11,9 @@ The Planner is responsible for:
 4. Validating destination paths
 """
 import json
+import os
 from pathlib import Path
 from datetime import datetime
-from unittest.mock import patch, MagicMock
 
 import pytest
 
@@ -33,10 +33,16 @@ from src.organizer.planner import (
 # Test Fixtures
 # =============================================================================
 
-@pytest.fixture
-def sample_file_record(temp_dir):
-    """Create a sample FileRecord."""
-    test_file = temp_dir / "documento.pdf"
+@pytest.fixture(scope="module")
+def planner_fixture_dir(tmp_path_factory):
+    """Module-wide directory for read-only fixture files."""
+    return tmp_path_factory.mktemp("planner")
+
+
+@pytest.fixture(scope="module")
+def sample_file_record(planner_fixture_dir):
+    """Create a sample FileRecord (shared; tests never modify it)."""
+    test_file = planner_fixture_dir / "documento.pdf"
     test_file.write_bytes(b"%PDF" + b"x" * 5000)
     
     return FileRecord(
@@ -49,7 +55,7 @@ def sample_file_record(temp_dir):
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_classification():
     """Create a sample Classification."""
     return Classification(
@@ -63,7 +69,7 @@ def sample_classification():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def image_classification():
     """Create an image Classification."""
     return Classification(
@@ -101,6 +107,12 @@ class TestSanitizeFilename:
         assert "/" not in result
         assert "\\" not in result
 
+    def test_sanitize_collapses_replaced_runs(self):
+        """Adjacent invalid characters should collapse to one underscore."""
+        result = sanitize_filename('a<>b|"c.txt')
+        
+        assert result == "a_b_c.txt"
+
     def test_sanitize_preserves_valid_chars(self):
         """Should preserve valid filename characters."""
         result = sanitize_filename("valid_filename-2024.pdf")
@@ -141,7 +153,7 @@ class TestResolveNamingConflict:
     def test_conflict_adds_version_suffix(self, temp_dir):
         """Existing file should get version suffix."""
         existing = temp_dir / "existing.pdf"
-        existing.write_text("content")
+        existing.touch()
         
         result = resolve_naming_conflict(existing)
         
@@ -151,17 +163,38 @@ class TestResolveNamingConflict:
     def test_multiple_conflicts_increment_version(self, temp_dir):
         """Multiple conflicts should increment version."""
         base = temp_dir / "file.pdf"
-        base.write_text("v1")
-        (temp_dir / "file_v2.pdf").write_text("v2")
+        base.touch()
+        (temp_dir / "file_v2.pdf").touch()
         
         result = resolve_naming_conflict(base)
         
         assert "_v3" in result.name or "(3)" in result.name
 
+    def test_freed_version_is_reused(self, temp_dir):
+        """A version name freed on disk should be handed out again."""
+        base = temp_dir / "file.pdf"
+        base.touch()
+        
+        first = resolve_naming_conflict(base)
+        first.touch()
+        assert resolve_naming_conflict(base).name == "file_v3.pdf"
+        
+        first.unlink()
+        assert resolve_naming_conflict(base).name == "file_v2.pdf"
+
+    @pytest.mark.skipif(os.name == "nt", reason="symlinks need privileges on Windows")
+    def test_dangling_symlink_counts_as_taken(self, temp_dir):
+        """A broken symlink at the destination must not be overwritten."""
+        dest = temp_dir / "file.pdf"
+        dest.symlink_to(temp_dir / "missing.pdf")
+        
+        assert resolve_naming_conflict(dest).name == "file_v2.pdf"
+        assert Planner(base_path=temp_dir).resolve(dest).name == "file_v2.pdf"
+
     def test_preserves_extension(self, temp_dir):
         """Should preserve file extension."""
         existing = temp_dir / "doc.docx"
-        existing.write_text("content")
+        existing.touch()
         
         result = resolve_naming_conflict(existing)
         
@@ -224,6 +257,23 @@ class TestBuildDestinationPath:
         
         assert "Vendas_Q1" in dest.name or "Vendas" in dest.name
 
+    def test_folder_is_memoized(self, sample_file_record, sample_classification):
+        """Files sharing category/subcategory/year should reuse the folder."""
+        from src.organizer.planner import _build_dest_dir
+        
+        _build_dest_dir.cache_clear()
+        base_path = Path("/Documents/Organizado")
+        other = sample_classification.model_copy(
+            update={"nome_sugerido": "2024-03-16__01_Trabalho__Vendas_Q2.pdf"}
+        )
+        
+        first = build_destination_path(base_path, sample_file_record, sample_classification)
+        second = build_destination_path(base_path, sample_file_record, other)
+        
+        assert first.parent == second.parent
+        assert first.name != second.name
+        assert _build_dest_dir.cache_info().hits == 1
+
 
 # =============================================================================
 # Test Create Plan Item
@@ -373,6 +423,68 @@ class TestPlannerCreatePlan:
         
         assert plan1[0].dst != plan2[0].dst
 
+    def test_create_plan_separates_same_destination_in_batch(
+        self, temp_dir, sample_file_record, sample_classification
+    ):
+        """Two files planned for the same new destination should not collide."""
+        planner = Planner(base_path=temp_dir)
+        
+        plan = planner.create_plan([
+            (sample_file_record, sample_classification),
+            (sample_file_record, sample_classification),
+        ])
+        
+        assert plan[0].dst != plan[1].dst
+        assert plan[1].dst.stem == plan[0].dst.stem + "_v2"
+
+    def test_resolve_probes_names_in_memory(self, temp_dir, monkeypatch):
+        """Planner.resolve should list each folder once, never stat per file."""
+        (temp_dir / "report.pdf").touch()
+        planner = Planner(base_path=temp_dir)
+        
+        def no_stat(self):
+            raise AssertionError("Path.exists() should not be called")
+        
+        monkeypatch.setattr(Path, "exists", no_stat)
+        
+        assert planner.resolve(temp_dir / "report.pdf").name == "report_v2.pdf"
+        assert planner.resolve(temp_dir / "report.pdf").name == "report_v3.pdf"
+        assert planner.resolve(temp_dir / "other.pdf").name == "other.pdf"
+
+    def test_reset_forgets_assigned_names(self, temp_dir):
+        """reset() should start a fresh run."""
+        planner = Planner(base_path=temp_dir)
+        
+        planner.resolve(temp_dir / "report.pdf")
+        planner.reset()
+        
+        assert planner.resolve(temp_dir / "report.pdf").name == "report.pdf"
+
+    def test_create_plan_matches_single_items(
+        self, temp_dir, sample_file_record, sample_classification, image_classification
+    ):
+        """Bulk-validated plan should equal per-item create_plan_item output."""
+        pairs = [
+            (sample_file_record, sample_classification),
+            (sample_file_record, None),
+            (sample_file_record, image_classification),
+        ]
+        
+        plan = Planner(base_path=temp_dir).create_plan(pairs)
+        single = [
+            create_plan_item(record, classification, temp_dir, action="MOVE" if classification else "SKIP")
+            for record, classification in pairs
+        ]
+        
+        assert plan == single
+
+    def test_create_plan_rejects_invalid_action(self, temp_dir, sample_file_record, sample_classification):
+        """An invalid default action should fail validation."""
+        planner = Planner(base_path=temp_dir, default_action="DELETE")
+        
+        with pytest.raises(ValueError):
+            planner.create_plan([(sample_file_record, sample_classification)])
+
 
 class TestPlannerSavePlan:
     """Test Planner plan saving."""
@@ -389,6 +501,49 @@ class TestPlannerSavePlan:
         data = json.loads(json_path.read_text())
         assert len(data["items"]) == 1
 
+    def test_load_plan_json_round_trip(self, temp_dir, sample_file_record, sample_classification):
+        """Loading a saved plan should give back equal PlanItems."""
+        planner = Planner(base_path=temp_dir)
+        plan = planner.create_plan([
+            (sample_file_record, sample_classification),
+            (sample_file_record, None),
+        ])
+        
+        json_path = temp_dir / "plan.json"
+        planner.save_plan_json(plan, json_path)
+        loaded = planner.load_plan_json(json_path)
+        
+        assert loaded == plan
+        assert isinstance(loaded[0].src, Path)
+
+    def test_load_plan_json_ignores_unknown_keys(self, temp_dir):
+        """Extra keys in saved items should not make the plan fail to load."""
+        json_path = temp_dir / "plan.json"
+        json_path.write_text(json.dumps({"items": [{
+            "action": "MOVE",
+            "src": "a.pdf",
+            "dst": "b/a.pdf",
+            "reason": "test",
+            "confidence": 90,
+            "reviewed_by": "someone",
+        }]}))
+        
+        loaded = Planner(base_path=temp_dir).load_plan_json(json_path)
+        
+        assert loaded[0].dst == Path("b/a.pdf")
+        assert loaded[0].rule_id is None and loaded[0].llm_used is False
+
+    def test_save_empty_plan_json(self, temp_dir):
+        """An empty plan should still be written as valid JSON."""
+        planner = Planner(base_path=temp_dir)
+        
+        json_path = temp_dir / "plan.json"
+        planner.save_plan_json([], json_path)
+        
+        data = json.loads(json_path.read_text())
+        assert data["items"] == []
+        assert data["stats"]["total_planned"] == 0
+
     def test_save_plan_markdown(self, temp_dir, sample_file_record, sample_classification):
         """Should save plan as Markdown for review."""
         planner = Planner(base_path=temp_dir)
@@ -424,3 +579,19 @@ class TestPlannerStats:
         
         assert planner.stats["by_action"]["MOVE"] >= 1
         assert planner.stats["by_action"]["SKIP"] >= 1
+
+    def test_tracks_categories_and_exact_counts(
+        self, temp_dir, sample_file_record, sample_classification, image_classification
+    ):
+        """Stats should count each action and category exactly once."""
+        planner = Planner(base_path=temp_dir)
+        
+        planner.create_plan([
+            (sample_file_record, sample_classification),
+            (sample_file_record, sample_classification),
+            (sample_file_record, image_classification),
+            (sample_file_record, None),
+        ])
+        
+        assert planner.stats["by_action"] == {"MOVE": 3, "COPY": 0, "SKIP": 1, "RENAME": 0}
+        assert planner.stats["by_category"] == {"01_Trabalho": 2, "05_Pessoal": 1}
@@ -10,17 +10,23 @@ The Rule Engine is responsible for:
 3. Returning deterministic Classification with high confidence
 4. Falling back to None for files that need LLM classification
 """
+import copy
+import os
+import shutil
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
 from unittest.mock import patch, MagicMock
 
 import pytest
 
 from src.organizer.models import FileRecord, Classification, VALID_CATEGORIES
+import src.organizer.rules as rules_module
 from src.organizer.rules import (
     RuleEngine,
     Rule,
     load_rules_from_yaml,
+    keyword_haystack,
     match_extension_pattern,
     match_keywords,
 )
@@ -30,10 +36,10 @@ from src.organizer.rules import (
 # Test Fixtures
 # =============================================================================
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_rules_config():
-    """Sample rules configuration dict."""
-    return {
+    """Sample rules configuration, frozen so shared users cannot mutate it."""
+    config = {
         "rules": [
             {
                 "rule_id": "IMG_BY_YEAR",
@@ -63,35 +69,100 @@ def sample_rules_config():
             },
         ]
     }
+    return MappingProxyType({
+        "rules": tuple(
+            MappingProxyType({
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in rule.items()
+            })
+            for rule in config["rules"]
+        )
+    })
+
+
+@pytest.fixture(scope="session")
+def rule_engine(sample_rules_config):
+    """RuleEngine built once from sample_rules_config."""
+    return RuleEngine(rules_config=sample_rules_config)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_rule_stats(rule_engine):
+    """Isolate tests from stats accumulated on the shared engine."""
+    rule_engine.reset_stats()
+
+
+@pytest.fixture(scope="session")
+def now_ts():
+    """Fixed timestamp for deterministic records."""
+    return datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture(scope="session")
+def rules_template_dir(tmp_path_factory, make_sized_file):
+    """Write the sample payload files once per session."""
+    template = tmp_path_factory.mktemp("rules_template")
+    (template / "photo.jpg").write_bytes(b"\xff\xd8\xff" + b"x" * 2000)
+    make_sized_file(template / "document.pdf", b"%PDF-1.4", 6_000_008)  # > 5MB
+    make_sized_file(template / "fatura_janeiro.pdf", b"%PDF-1.4", 10008)
+    return template
+
+
+class FakeAutomaton:
+    """Minimal stand-in for pyahocorasick.Automaton (substring search)."""
+
+    def __init__(self):
+        self.words = {}
+        self.scans = 0
+
+    def add_word(self, word, value):
+        self.words[word] = value
+
+    def make_automaton(self):
+        pass
+
+    def iter(self, haystack):
+        self.scans += 1
+        for word, value in self.words.items():
+            if word in haystack:
+                yield haystack.index(word) + len(word) - 1, value
+
+
+def materialize(template: Path, name: str, dest_dir: Path) -> Path:
+    """Hardlink a template file into dest_dir (copy if linking fails)."""
+    dest = dest_dir / name
+    try:
+        os.link(template / name, dest)
+    except OSError:
+        shutil.copy2(template / name, dest)
+    return dest
 
 
 @pytest.fixture
-def sample_image_record(temp_dir):
+def sample_image_record(temp_dir, rules_template_dir, now_ts):
     """Create a sample image FileRecord."""
-    img_path = temp_dir / "photo.jpg"
-    img_path.write_bytes(b"\xff\xd8\xff" + b"x" * 2000)
+    img_path = materialize(rules_template_dir, "photo.jpg", temp_dir)
     
     return FileRecord(
         path=img_path,
         size=2003,
-        mtime=datetime.now(),
-        ctime=datetime.now(),
+        mtime=now_ts,
+        ctime=now_ts,
         extension=".jpg",
         mime="image/jpeg",
     )
 
 
 @pytest.fixture
-def sample_pdf_record(temp_dir):
+def sample_pdf_record(temp_dir, rules_template_dir, now_ts):
     """Create a sample PDF FileRecord."""
-    pdf_path = temp_dir / "document.pdf"
-    pdf_path.write_bytes(b"%PDF-1.4" + b"x" * 6_000_000)  # > 5MB
+    pdf_path = materialize(rules_template_dir, "document.pdf", temp_dir)
     
     return FileRecord(
         path=pdf_path,
         size=6_000_008,
-        mtime=datetime.now(),
-        ctime=datetime.now(),
+        mtime=now_ts,
+        ctime=now_ts,
         extension=".pdf",
         mime="application/pdf",
         content_excerpt="Este é um livro sobre programação Python.",
@@ -99,16 +170,15 @@ def sample_pdf_record(temp_dir):
 
 
 @pytest.fixture
-def sample_invoice_record(temp_dir):
+def sample_invoice_record(temp_dir, rules_template_dir, now_ts):
     """Create a sample invoice FileRecord."""
-    pdf_path = temp_dir / "fatura_janeiro.pdf"
-    pdf_path.write_bytes(b"%PDF-1.4" + b"x" * 10000)
+    pdf_path = materialize(rules_template_dir, "fatura_janeiro.pdf", temp_dir)
     
     return FileRecord(
         path=pdf_path,
         size=10008,
-        mtime=datetime.now(),
-        ctime=datetime.now(),
+        mtime=now_ts,
+        ctime=now_ts,
         extension=".pdf",
         mime="application/pdf",
         content_excerpt="FATURA - Pagamento referente ao mês de janeiro.",
@@ -170,6 +240,28 @@ class TestRuleModel:
         
         assert rule.category in VALID_CATEGORIES
 
+    def test_rule_expands_pattern_once(self):
+        """Rule should precompute its lowercase extension set."""
+        rule = Rule(
+            rule_id="TEST",
+            pattern="*.{JPG, png}",
+            category="05_Pessoal",
+            confidence=90,
+        )
+        
+        assert rule.extensions == frozenset({"jpg", "png"})
+
+    def test_rule_compiled_matcher_applies_size_bounds(self, sample_invoice_record):
+        """Compiled matcher should honour min/max size and skip absent bounds."""
+        def rule_with(**limits):
+            return Rule(rule_id="T", pattern="*.pdf", category="02_Financas", confidence=90, **limits)
+        
+        # sample_invoice_record is 10008 bytes
+        assert rule_with()._match(sample_invoice_record)
+        assert rule_with(max_size_mb=0.001)._match(sample_invoice_record) is False
+        assert rule_with(min_size_mb=1)._match(sample_invoice_record) is False
+        assert rule_with(min_size_mb=0.001, max_size_mb=1)._match(sample_invoice_record)
+
 
 # =============================================================================
 # Test Pattern Matching
@@ -249,6 +341,11 @@ class TestMatchKeywords:
         assert match_keywords("any content", [])
         assert match_keywords("any content", None)
 
+    def test_keyword_haystack_lowercases_content_and_filename(self):
+        """Haystack should hold lowercased content plus filename."""
+        assert keyword_haystack("FATURA Janeiro", "NF_01.pdf") == "fatura janeiro nf_01.pdf"
+        assert keyword_haystack(None, None) == ""
+
 
 # =============================================================================
 # Test Load Rules
@@ -264,6 +361,23 @@ class TestLoadRulesFromYaml:
         assert len(rules) == 3
         assert all(isinstance(r, Rule) for r in rules)
 
+    def test_load_rules_from_plain_dict(self, sample_rules_config):
+        """Plain dicts and read-only mappings should load the same rules."""
+        plain = {"rules": [dict(rule) for rule in sample_rules_config["rules"]]}
+        
+        from_plain = load_rules_from_yaml(plain)
+        from_proxy = load_rules_from_yaml(sample_rules_config)
+        
+        assert [r.rule_id for r in from_plain] == [r.rule_id for r in from_proxy]
+        assert from_plain[1].keywords == ["livro", "book", "ebook"]
+
+    def test_sample_config_is_read_only(self, sample_rules_config):
+        """Shared config fixture should reject mutation."""
+        with pytest.raises(TypeError):
+            sample_rules_config["rules"] = ()
+        with pytest.raises(TypeError):
+            sample_rules_config["rules"][0]["confidence"] = 1
+
     def test_load_rules_preserves_order(self, sample_rules_config):
         """Rules should maintain config order."""
         rules = load_rules_from_yaml(sample_rules_config)
@@ -289,6 +403,28 @@ rules:
         assert len(rules) == 1
         assert rules[0].rule_id == "TEST"
 
+    def test_load_rules_from_file_is_cached_until_modified(self, temp_dir, monkeypatch):
+        """Unchanged files should not be parsed again; edits should be picked up."""
+        yaml_file = temp_dir / "rules.yaml"
+        yaml_file.write_text('rules:\n  - {rule_id: A, pattern: "*.txt", category: "05_Pessoal"}\n')
+        
+        parses = []
+        real_safe_load = rules_module.yaml.safe_load
+        monkeypatch.setattr(
+            rules_module.yaml, "safe_load", lambda f: parses.append(1) or real_safe_load(f)
+        )
+        
+        first = load_rules_from_yaml(yaml_file)
+        second = load_rules_from_yaml(str(yaml_file))
+        assert len(parses) == 1
+        assert first == second
+        
+        yaml_file.write_text('rules:\n  - {rule_id: B, pattern: "*.pdf", category: "04_Livros"}\n')
+        os.utime(yaml_file, ns=(0, yaml_file.stat().st_mtime_ns + 1_000_000_000))
+        
+        assert load_rules_from_yaml(yaml_file)[0].rule_id == "B"
+        assert len(parses) == 2
+
 
 # =============================================================================
 # Test Rule Engine
@@ -297,11 +433,9 @@ rules:
 class TestRuleEngineInit:
     """Test RuleEngine initialization."""
 
-    def test_init_with_rules(self, sample_rules_config):
+    def test_init_with_rules(self, rule_engine):
         """Should initialize with rules."""
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
-        assert len(engine.rules) == 3
+        assert len(rule_engine.rules) == 3
 
     def test_init_default_confidence_threshold(self):
         """Should have default confidence threshold."""
@@ -319,68 +453,141 @@ class TestRuleEngineInit:
 class TestRuleEngineClassify:
     """Test RuleEngine.classify() method."""
 
-    def test_classify_image_by_extension(self, sample_rules_config, sample_image_record):
+    def test_classify_image_by_extension(self, rule_engine, sample_image_record):
         """Should classify image by extension rule."""
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
-        classification = engine.classify(sample_image_record)
+        classification = rule_engine.classify(sample_image_record)
         
         assert classification is not None
         assert classification.categoria == "05_Pessoal"
         assert classification.subcategoria == "Midia/Imagens"
         assert classification.confianca == 100
+        assert classification.nome_sugerido.startswith("2024-01-01__05_Pessoal__photo")
 
-    def test_classify_with_keywords(self, sample_rules_config, sample_invoice_record):
+    def test_classify_with_keywords(self, rule_engine, sample_invoice_record):
         """Should classify by keywords in content."""
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
-        classification = engine.classify(sample_invoice_record)
+        classification = rule_engine.classify(sample_invoice_record)
         
         assert classification is not None
         assert classification.categoria == "02_Financas"
         assert "fatura" in classification.racional.lower() or "invoice" in classification.racional.lower()
 
-    def test_classify_with_size_filter(self, sample_rules_config, sample_pdf_record):
+    def test_classify_with_size_filter(self, rule_engine, sample_pdf_record):
         """Should apply size filter to rules."""
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
-        classification = engine.classify(sample_pdf_record)
+        classification = rule_engine.classify(sample_pdf_record)
         
         # Should match PDF_BOOKS rule (>5MB and has "livro" keyword)
         assert classification is not None
         assert classification.categoria == "04_Livros"
 
-    def test_classify_returns_none_for_unmatched(self, sample_rules_config, temp_dir):
-        """Should return None for files that don't match any rule."""
+    def test_classify_keeps_rule_order_per_extension(self, sample_invoice_record):
+        """Rules indexed by extension should still be tried in file order."""
+        engine = RuleEngine(rules_config={"rules": [
+            {"rule_id": "IMAGES", "pattern": "*.jpg", "category": "05_Pessoal", "confidence": 100},
+            {"rule_id": "FIRST", "pattern": "*.{pdf,docx}", "category": "02_Financas", "confidence": 90},
+            {"rule_id": "SECOND", "pattern": "*.pdf", "category": "01_Trabalho", "confidence": 90},
+        ]})
+        
+        classification = engine.classify(sample_invoice_record)
+        
+        assert classification.racional.startswith("Matched rule: FIRST")
+
+    def test_classify_matches_mixed_case_keywords(self, sample_invoice_record):
+        """Rule keywords are lowercased once at load and match any case."""
+        engine = RuleEngine(rules_config={"rules": [
+            {"rule_id": "INVOICES", "pattern": "*.pdf", "keywords": ["Fatura"],
+             "category": "02_Financas", "confidence": 90},
+        ]})
+        
+        assert engine.rules[0].keywords_lower == ("fatura",)
+        assert engine.classify(sample_invoice_record) is not None
+
+    def test_classify_uses_keyword_automaton(
+        self, sample_rules_config, sample_invoice_record, sample_pdf_record, monkeypatch
+    ):
+        """With pyahocorasick available, keyword rules come from one automaton scan."""
+        monkeypatch.setattr(
+            rules_module, "_get_ahocorasick",
+            lambda: SimpleNamespace(Automaton=FakeAutomaton),
+        )
         engine = RuleEngine(rules_config=sample_rules_config)
         
+        assert engine.classify(sample_invoice_record).categoria == "02_Financas"
+        assert engine.classify(sample_pdf_record).categoria == "04_Livros"
+        assert engine._keyword_automaton.scans == 2
+
+    def test_keyword_automaton_survives_copied_rules(
+        self, sample_rules_config, sample_invoice_record, sample_pdf_record, monkeypatch
+    ):
+        """Copied Rule objects should still match through the automaton."""
+        monkeypatch.setattr(
+            rules_module, "_get_ahocorasick",
+            lambda: SimpleNamespace(Automaton=FakeAutomaton),
+        )
+        rules = [copy.deepcopy(rule) for rule in load_rules_from_yaml(sample_rules_config)]
+        engine = RuleEngine(rules_config=rules)
+        
+        assert engine.classify(sample_invoice_record).categoria == "02_Financas"
+        assert engine.classify(sample_pdf_record).categoria == "04_Livros"
+
+    def test_classify_with_real_ahocorasick(
+        self, sample_rules_config, sample_invoice_record, sample_pdf_record, temp_dir, now_ts
+    ):
+        """Keyword rules should match through a real pyahocorasick automaton."""
+        pytest.importorskip("ahocorasick")
+        engine = RuleEngine(rules_config=sample_rules_config)
+        plain = FileRecord(
+            path=temp_dir / "relatorio.pdf", size=10008, mtime=now_ts, ctime=now_ts,
+            extension=".pdf", content_excerpt="Sem palavras-chave aqui.",
+        )
+        
+        assert engine._keyword_automaton is not None
+        assert engine.classify(sample_invoice_record).categoria == "02_Financas"
+        assert engine.classify(sample_pdf_record).categoria == "04_Livros"
+        assert engine.classify(plain) is None
+
+    def test_classify_many_matches_single_classify(
+        self, rule_engine, sample_image_record, sample_invoice_record, sample_pdf_record, temp_dir, now_ts
+    ):
+        """Batched classification should equal per-record results, in order."""
+        unknown_record = FileRecord(
+            path=temp_dir / "random.xyz", size=1000, mtime=now_ts, ctime=now_ts, extension=".xyz"
+        )
+        records = [sample_invoice_record, unknown_record, sample_image_record, sample_pdf_record]
+        
+        batched = rule_engine.classify_many(records)
+        batch_stats = rule_engine.stats
+        rule_engine.reset_stats()
+        single = [rule_engine.classify(record) for record in records]
+        
+        assert batched == single
+        assert batched[1] is None
+        assert batch_stats == rule_engine.stats
+
+    def test_classify_returns_none_for_unmatched(self, rule_engine, temp_dir, now_ts):
+        """Should return None for files that don't match any rule."""
         # Create record that doesn't match any rule
         unknown_record = FileRecord(
             path=temp_dir / "random.xyz",
             size=1000,
-            mtime=datetime.now(),
-            ctime=datetime.now(),
+            mtime=now_ts,
+            ctime=now_ts,
             extension=".xyz",
             content_excerpt="Random content without keywords.",
         )
         
-        classification = engine.classify(unknown_record)
+        classification = rule_engine.classify(unknown_record)
         
         assert classification is None
 
-    def test_first_matching_rule_wins(self, sample_rules_config):
+    def test_first_matching_rule_wins(self, rule_engine):
         """First matching rule should be used."""
         # Rules are evaluated in order
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
         # Both INVOICES and general PDF rules could match, but order matters
-        assert engine.rules[0].rule_id == "IMG_BY_YEAR"
+        assert rule_engine.rules[0].rule_id == "IMG_BY_YEAR"
 
-    def test_classification_has_rule_id(self, sample_rules_config, sample_image_record):
+    def test_classification_has_rule_id(self, rule_engine, sample_image_record):
         """Classification should reference the rule used."""
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
-        classification = engine.classify(sample_image_record)
+        classification = rule_engine.classify(sample_image_record)
         
         assert "IMG_BY_YEAR" in classification.racional
 
@@ -388,19 +595,24 @@ class TestRuleEngineClassify:
 class TestRuleEngineStats:
     """Test RuleEngine statistics."""
 
-    def test_tracks_classifications(self, sample_rules_config, sample_image_record):
+    def test_tracks_classifications(self, rule_engine, sample_image_record):
         """Should track number of classifications."""
-        engine = RuleEngine(rules_config=sample_rules_config)
-        
-        engine.classify(sample_image_record)
-        engine.classify(sample_image_record)
+        rule_engine.classify(sample_image_record)
+        rule_engine.classify(sample_image_record)
         
-        assert engine.stats["total_classified"] == 2
+        assert rule_engine.stats["total_classified"] == 2
 
-    def test_tracks_rule_hits(self, sample_rules_config, sample_image_record):
+    def test_tracks_rule_hits(self, rule_engine, sample_image_record):
         """Should track which rules were used."""
-        engine = RuleEngine(rules_config=sample_rules_config)
+        rule_engine.classify(sample_image_record)
         
-        engine.classify(sample_image_record)
+        assert rule_engine.stats["rule_hits"]["IMG_BY_YEAR"] >= 1
+
+    def test_reset_stats_keeps_rules(self, rule_engine, sample_image_record):
+        """reset_stats should zero counters without touching rules."""
+        rule_engine.classify(sample_image_record)
+        rule_engine.reset_stats()
         
-        assert engine.stats["rule_hits"]["IMG_BY_YEAR"] >= 1
+        assert rule_engine.stats["total_classified"] == 0
+        assert rule_engine.stats["rule_hits"] == {}
+        assert len(rule_engine.rules) == 3
@@ -20,11 +20,16 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 from src.organizer.models import FileRecord
+import src.organizer.scanner as scanner_module
 from src.organizer.scanner import (
     Scanner,
     EXCLUDED_DIRECTORIES,
     EXCLUDED_EXTENSIONS,
     DEFAULT_MIN_FILE_SIZE,
+    HASH_BLOCK_SIZE,
+    PARALLEL_WALK_MIN_SUBDIRS,
+    PREFETCH_MAX_BYTES,
+    PREFETCH_MIN_BYTES,
     calculate_sha256,
     should_exclude_directory,
     should_exclude_file,
@@ -66,6 +71,11 @@ class TestExclusionConstants:
         assert ".bat" in EXCLUDED_EXTENSIONS
         assert ".ps1" in EXCLUDED_EXTENSIONS
 
+    def test_exclusion_sets_are_frozensets(self):
+        """Exclusion sets should be immutable frozensets."""
+        assert isinstance(EXCLUDED_DIRECTORIES, frozenset)
+        assert isinstance(EXCLUDED_EXTENSIONS, frozenset)
+
     def test_default_min_file_size(self):
         """Default minimum file size should be 1KB."""
         assert DEFAULT_MIN_FILE_SIZE == 1024
@@ -129,6 +139,37 @@ class TestCalculateSha256:
         result = calculate_sha256(test_file)
         assert result == expected
 
+    def test_calculate_sha256_spans_blocks(self, temp_dir):
+        """Should hash files spanning several blocks with a partial tail."""
+        test_file = temp_dir / "blocks.bin"
+        content = bytes(range(256)) * (HASH_BLOCK_SIZE // 256 * 2) + b"tail"
+        test_file.write_bytes(content)
+        
+        assert calculate_sha256(test_file) == hashlib.sha256(content).hexdigest()
+
+    def test_calculate_sha256_reuses_thread_buffer(self, temp_dir):
+        """Consecutive hashes on one thread should share one read buffer."""
+        first = temp_dir / "first.bin"
+        second = temp_dir / "second.bin"
+        first.write_bytes(b"a" * 5000)
+        second.write_bytes(b"b" * 3000)
+        
+        assert calculate_sha256(first) == hashlib.sha256(b"a" * 5000).hexdigest()
+        buffer = scanner_module._read_buffer()
+        assert calculate_sha256(second) == hashlib.sha256(b"b" * 3000).hexdigest()
+        assert scanner_module._read_buffer() is buffer
+
+
+class TestExtension:
+    """Test the scanner's name-based extension helper."""
+
+    @pytest.mark.parametrize("name", [
+        "report.PDF", "archive.tar.GZ", ".bashrc", "trailing.", "noext", "a.b.", "..x",
+    ])
+    def test_extension_matches_path_suffix(self, name):
+        """Should agree with Path.suffix.lower() without building a Path."""
+        assert scanner_module._extension(name) == Path(name).suffix.lower()
+
 
 class TestShouldExcludeDirectory:
     """Test directory exclusion logic."""
@@ -232,6 +273,19 @@ class TestScannerInit:
         
         assert scanner.excluded_extensions == custom_ext
 
+    def test_scanner_freezes_custom_exclusions(self, temp_dir):
+        """Custom sets should be copied to frozensets, extensions lowercased."""
+        custom_dirs = {"skip_me"}
+        scanner = Scanner(excluded_dirs=custom_dirs, excluded_extensions={".LOG"})
+        custom_dirs.add("later")
+        
+        assert isinstance(scanner.excluded_dirs, frozenset)
+        assert scanner.excluded_dirs == {"skip_me"}
+        assert scanner.excluded_extensions == {".log"}
+        
+        (temp_dir / "app.log").write_text("x" * 2000)
+        assert list(scanner.scan(temp_dir)) == []
+
 
 class TestScannerScan:
     """Test Scanner.scan() method."""
@@ -277,6 +331,86 @@ class TestScannerScan:
         paths = {r.path.name for r in records}
         assert paths == {"root.txt", "nested.txt"}
 
+    def test_scan_wide_tree_parallel_walk_matches_serial(self, temp_dir):
+        """Parallel directory listing should find the same files and exclusions."""
+        for i in range(PARALLEL_WALK_MIN_SUBDIRS + 2):
+            deep = temp_dir / f"dir_{i}" / "inner"
+            deep.mkdir(parents=True)
+            (deep / f"file_{i}.txt").write_bytes(bytes([i]) * 2000)
+            (temp_dir / f"dir_{i}" / "node_modules").mkdir()
+        (temp_dir / "root.txt").write_text("x" * 2000)
+        
+        serial = Scanner(walk_workers=1)
+        parallel = Scanner(walk_workers=4)
+        serial_paths = [r.path for r in serial.scan(temp_dir)]
+        parallel_paths = [r.path for r in parallel.scan(temp_dir)]
+        
+        assert parallel_paths == serial_paths
+        assert len(parallel_paths) == PARALLEL_WALK_MIN_SUBDIRS + 3
+        assert parallel.stats == serial.stats
+        assert parallel.stats["directories_excluded"] == PARALLEL_WALK_MIN_SUBDIRS + 2
+
+    def test_parallel_walk_keeps_depth_first_order(self, temp_dir):
+        """Order should not depend on walk_workers, even past the read-ahead window."""
+        for i in range(30):
+            sub = temp_dir / f"d{i:02d}"
+            (sub / "sub").mkdir(parents=True)
+            (sub / "a.txt").write_text("x" * 2000)
+            (sub / "sub" / "b.txt").write_text("y" * 2000)
+        
+        orders = [
+            [r.path for r in Scanner(walk_workers=workers, hash_workers=1).scan(temp_dir)]
+            for workers in (1, 2, 8)
+        ]
+        
+        assert orders[0] == orders[1] == orders[2]
+        # Depth-first: each directory's subtree follows it directly
+        first = orders[0][0].parent
+        assert orders[0][1] == first / "sub" / "b.txt"
+
+    def test_scan_wide_tree_counts_unstatable_entries(self, temp_dir):
+        """Entries whose prefetched stat fails should still be counted as excluded."""
+        for i in range(PARALLEL_WALK_MIN_SUBDIRS + 1):
+            sub = temp_dir / f"dir_{i}"
+            sub.mkdir()
+            (sub / "file.txt").write_text("x" * 2000)
+        (temp_dir / "dir_0" / "dangling.txt").symlink_to(temp_dir / "missing.txt")
+        
+        scanner = Scanner(walk_workers=4)
+        records = list(scanner.scan(temp_dir))
+        
+        assert len(records) == PARALLEL_WALK_MIN_SUBDIRS + 1
+        assert scanner.stats["files_excluded"] == 1
+
+    def test_scan_skips_directory_symlinks(self, temp_dir):
+        """Symlinks to directories should be neither followed nor yielded."""
+        root = temp_dir / "root"
+        other = temp_dir / "other"
+        root.mkdir()
+        other.mkdir()
+        (root / "file.txt").write_text("x" * 2000)
+        (other / "outside.txt").write_text("y" * 2000)
+        (root / "link").symlink_to(other, target_is_directory=True)
+        
+        scanner = Scanner()
+        records = list(scanner.scan(root))
+        
+        assert [r.path.name for r in records] == ["file.txt"]
+        assert scanner.stats["files_scanned"] == 1
+        assert scanner.stats["files_excluded"] == 0
+
+    def test_scan_excludes_extensions_case_insensitively(self, temp_dir):
+        """Upper-case names of excluded types should be skipped too."""
+        (temp_dir / "SETUP.EXE").write_bytes(b"MZ" + b"x" * 2000)
+        (temp_dir / "Notes.TXT").write_text("x" * 2000)
+        
+        scanner = Scanner()
+        records = list(scanner.scan(temp_dir))
+        
+        assert [r.path.name for r in records] == ["Notes.TXT"]
+        assert records[0].extension == ".txt"
+        assert scanner.stats["files_excluded"] == 1
+
     def test_scan_excludes_small_files(self, temp_dir):
         """Should not include files smaller than minimum size."""
         large_file = temp_dir / "large.txt"
@@ -335,6 +469,77 @@ class TestScannerScan:
         assert len(records) == 1
         assert records[0].path.name == "src.js"
 
+    def test_scan_excludes_nested_files_in_excluded_dir(self, temp_dir):
+        """Files deep inside an excluded directory should never be visited."""
+        nested = temp_dir / "project" / ".git" / "objects" / "ab"
+        nested.mkdir(parents=True)
+        (nested / "blob.txt").write_text("x" * 2000)
+        (temp_dir / "project" / "readme.txt").write_text("x" * 2000)
+        
+        scanner = Scanner()
+        records = list(scanner.scan(temp_dir))
+        
+        assert [r.path.name for r in records] == ["readme.txt"]
+        assert scanner.stats["directories_excluded"] == 1
+
+    def test_scan_uses_custom_excluded_dirs(self, temp_dir):
+        """Custom excluded_dirs should drive pruning during the scan."""
+        (temp_dir / "skip_me").mkdir()
+        (temp_dir / "skip_me" / "file.txt").write_text("x" * 2000)
+        (temp_dir / "keep.txt").write_text("x" * 2000)
+        
+        scanner = Scanner(excluded_dirs={"skip_me"})
+        records = list(scanner.scan(temp_dir))
+        
+        assert [r.path.name for r in records] == ["keep.txt"]
+
+    def test_scan_reuses_walk_stat(self, temp_dir, monkeypatch):
+        """Scanner should hand the walk's stat to the record, not re-stat."""
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "sub" / "doc.txt").write_text("x" * 2000)
+        
+        received = []
+        create_file_record = Scanner._create_file_record
+        
+        def spy(self, file_path, stat=None, compute_hash=True):
+            received.append(stat)
+            return create_file_record(self, file_path, stat, compute_hash)
+        
+        monkeypatch.setattr(Scanner, "_create_file_record", spy)
+        records = list(Scanner().scan(temp_dir))
+        
+        assert [r.size for r in records] == [2000]
+        assert received[0] is not None and received[0].st_size == 2000
+
+    def test_scan_without_hash_reads_no_content(self, temp_dir, monkeypatch):
+        """compute_hash=False should keep metadata and never hash a file."""
+        for i in range(3):
+            (temp_dir / f"file_{i}.txt").write_text("x" * 2000)
+        
+        def no_hash(path):
+            raise AssertionError("file hashed")
+        monkeypatch.setattr(scanner_module, "calculate_sha256", no_hash)
+        
+        scanner = Scanner(hash_workers=4)
+        records = list(scanner.scan(temp_dir, compute_hash=False))
+        
+        assert len(records) == 3
+        assert all(r.sha256 is None and r.size == 2000 for r in records)
+        assert scanner.stats["total_size_bytes"] == 6000
+
+    def test_shared_timestamps_reuse_datetime(self, temp_dir):
+        """Files with the same mtime should share one converted datetime."""
+        stamp = 1_700_000_000.25
+        for name in ("a.txt", "b.txt"):
+            path = temp_dir / name
+            path.write_text("x" * 2000)
+            os.utime(path, (stamp, stamp))
+        
+        records = list(Scanner(hash_workers=1).scan(temp_dir))
+        
+        assert records[0].mtime == datetime.fromtimestamp(stamp)
+        assert records[0].mtime is records[1].mtime
+
     def test_scan_returns_file_record_with_metadata(self, temp_dir):
         """FileRecord should contain proper metadata."""
         test_file = temp_dir / "document.pdf"
@@ -406,6 +611,72 @@ class TestScannerFileRecord:
         
         assert records[0].content_excerpt is None
 
+    def test_parallel_hashing_matches_serial_order(self, temp_dir):
+        """Concurrent hashing should keep walk order and digests."""
+        for i in range(40):
+            (temp_dir / f"file_{i:02d}.txt").write_bytes(bytes([i]) * 2000)
+        
+        serial = list(Scanner(hash_workers=1).scan(temp_dir))
+        parallel = list(Scanner(hash_workers=4).scan(temp_dir))
+        
+        assert [(r.path, r.sha256) for r in parallel] == [(r.path, r.sha256) for r in serial]
+        assert len(parallel) == 40
+        digests = {r.path.name: r.sha256 for r in parallel}
+        assert digests["file_07.txt"] == hashlib.sha256(bytes([7]) * 2000).hexdigest()
+
+    def test_parallel_scan_prefetches_queued_large_files(
+        self, temp_dir, monkeypatch, make_sized_file
+    ):
+        """Only large files waiting behind busy workers should get a readahead hint."""
+        for i in range(6):
+            make_sized_file(temp_dir / f"big_{i}.bin", b"x", PREFETCH_MIN_BYTES + i)
+            (temp_dir / f"small_{i}.txt").write_bytes(bytes([i]) * 2000)
+        
+        prefetched = []
+        monkeypatch.setattr(
+            scanner_module, "_prefetch",
+            lambda path, size: prefetched.append((path.name, size)),
+        )
+        
+        records = list(Scanner(hash_workers=2).scan(temp_dir))
+        
+        assert len(records) == 12
+        assert prefetched
+        assert all(name.startswith("big_") for name, _ in prefetched)
+        assert all(size >= PREFETCH_MIN_BYTES for _, size in prefetched)
+
+    def test_prefetch_caps_advised_length(self, temp_dir, monkeypatch, make_sized_file):
+        """The readahead hint should cover at most PREFETCH_MAX_BYTES."""
+        path = make_sized_file(temp_dir / "huge.bin", b"x", PREFETCH_MAX_BYTES * 4)
+        
+        advised = []
+        monkeypatch.setattr(
+            scanner_module.os, "posix_fadvise",
+            lambda fd, offset, length, advice: advised.append(length),
+            raising=False,
+        )
+        scanner_module._prefetch(path, PREFETCH_MAX_BYTES * 4)
+        
+        assert advised == [PREFETCH_MAX_BYTES]
+
+    @pytest.mark.parametrize("n_files,workers", [(1, 4), (3, 1)])
+    def test_scan_without_overlap_skips_thread_pool(
+        self, temp_dir, monkeypatch, n_files, workers
+    ):
+        """A single candidate or a single worker should hash inline."""
+        for i in range(n_files):
+            (temp_dir / f"file_{i}.txt").write_bytes(b"x" * 2000)
+        
+        def no_pool(*args, **kwargs):
+            raise AssertionError("thread pool created")
+        monkeypatch.setattr(scanner_module, "ThreadPoolExecutor", no_pool)
+        
+        scanner = Scanner(hash_workers=workers)
+        records = list(scanner.scan(temp_dir))
+        
+        assert len(records) == n_files
+        assert scanner.stats["files_scanned"] == n_files
+
 
 class TestScannerStatistics:
     """Test Scanner statistics tracking."""
@@ -460,3 +731,29 @@ class TestScannerStatistics:
         list(scanner.scan(temp_dir))
         
         assert scanner.stats["total_size_bytes"] == 5000
+
+    def test_scan_stats_matches_scan_without_hashing(self, temp_dir, monkeypatch):
+        """scan_stats should report scan()'s statistics without hashing."""
+        (temp_dir / "node_modules").mkdir()
+        (temp_dir / "sub").mkdir()
+        (temp_dir / "file1.txt").write_bytes(b"x" * 2000)
+        (temp_dir / "sub" / "file2.txt").write_bytes(b"y" * 3000)
+        (temp_dir / "program.exe").write_bytes(b"x" * 2000)
+        (temp_dir / "tiny.txt").write_text("x")
+        
+        scanner = Scanner()
+        list(scanner.scan(temp_dir))
+        expected = dict(scanner.stats)
+        
+        def no_hash(path):
+            raise AssertionError("file hashed")
+        monkeypatch.setattr(scanner_module, "calculate_sha256", no_hash)
+        
+        assert scanner.scan_stats(temp_dir) == expected
+        assert expected["files_scanned"] == 2
+        assert expected["total_size_bytes"] == 5000
+
+    def test_scan_stats_missing_root(self, temp_dir):
+        """scan_stats should reject a missing root like scan()."""
+        with pytest.raises(FileNotFoundError):
+            Scanner().scan_stats(temp_dir / "missing")